@@ -29,12 +29,60 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("OPENAI_BASE_URL", "FIM_OPENAI_BASE_URL"),
     )
 
+    # Shared outbound HTTP session: keep-alive pools for up to http_pool_hosts
+    # hosts with http_pool_maxsize connections each. Call sites pass their own
+    # read timeouts; http_read_timeout_sec is the fallback.
+    http_pool_hosts: int = 10
+    http_pool_maxsize: int = 10
+    http_max_retries: int = 0
+    http_connect_timeout_sec: float = 5.0
+    http_read_timeout_sec: float = 30.0
+
+    # RSS hubs are fetched concurrently, at most feed_per_host_limit at a time
+    # per host; hubs still pending after feed_deadline_sec are skipped. All
+    # AP_HUBS feeds share one host, so the cap of 4 keeps each poll from
+    # opening a connection per hub there: the eight hubs go out in two waves
+    # and a poll takes about two feed round-trips. Raise it to len(AP_HUBS)
+    # to trade that politeness for a single wave.
+    feed_fetch_workers: int = 8
+    feed_per_host_limit: int = 4
+    feed_timeout_sec: float = 20.0
+    feed_deadline_sec: float = 30.0
+    # Revalidate hubs with ETag/Last-Modified and a body hash; unchanged hubs
+    # are not re-parsed.
+    feed_conditional_get: bool = True
+    # Ingest skips items whose ids are in an in-process LRU of stored raw
+    # events, warmed from the newest rows; 0 disables it.
+    seen_ids_capacity: int = 50000
+
     # Logging
     log_level: str = "INFO"
 
-    # Storage
+    # Storage. db_backend is "postgres" or "sqlite"; empty picks Postgres when
+    # a database URL is configured and SQLite (WAL) at db_path otherwise.
+    db_backend: str = ""
     db_path: str = "app/data/events.db"
     database_url: str = ""
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 10
+    db_pool_max_idle_sec: float = 300.0
+    db_pool_timeout_sec: float = 30.0
+    db_pool_check: bool = True
+    db_auto_migrate: bool = True
+    # Rows fetched per round trip by server-side (named) cursors in exports
+    # and streaming reads.
+    db_stream_batch_rows: int = 5000
+
+    # Work queue leases for the normalize/score stages.
+    queue_lease_sec: int = 300
+    queue_max_attempts: int = 5
+    queue_retry_backoff_sec: int = 60
+
+    # Event tables are partitioned by month of published_at. Months older than
+    # the retention window are detached into the archive schema; 0 keeps all.
+    retention_months: int = 0
+    retention_archive_schema: str = "archive"
+    partition_premake_months: int = 2
 
     # Ingestion endpoints. Override with JSON string in FIM_RAPIDAPI_ENDPOINTS.
     rapidapi_endpoints_json: str = ""
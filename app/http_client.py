@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import settings
+
+# One process-wide session so outbound calls reuse warm keep-alive
+# connections. urllib3 keeps a pool per host (up to http_pool_hosts hosts,
+# http_pool_maxsize connections each) and is safe to share across threads.
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=settings.http_pool_hosts,
+                    pool_maxsize=settings.http_pool_maxsize,
+                    max_retries=settings.http_max_retries,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def close_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _timeout(read_timeout: float | None) -> tuple[float, float]:
+    return settings.http_connect_timeout_sec, read_timeout or settings.http_read_timeout_sec
+
+
+def get(url: str, timeout: float | None = None, **kwargs: Any) -> requests.Response:
+    return get_session().get(url, timeout=_timeout(timeout), **kwargs)
+
+
+def post(url: str, timeout: float | None = None, **kwargs: Any) -> requests.Response:
+    return get_session().post(url, timeout=_timeout(timeout), **kwargs)
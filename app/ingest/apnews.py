@@ -1,17 +1,28 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
+import threading
+import time
 import uuid
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime
 from html import unescape
-from typing import Any
+from itertools import islice
+from typing import Any, Iterable, Iterator
+from urllib.parse import urlsplit
 from xml.etree import ElementTree
 
 import requests
 from dateutil import parser as date_parser
 
+from app import http_client
+from app.config import settings
+from app.ingest.html_extract import extract_article, strip_html
+from app.ingest.seen import SeenIds, get_seen_ids
 from app.models import RawEvent
 
 logger = logging.getLogger("app.ingest")
@@ -43,48 +54,107 @@ def get_categories() -> list[dict[str, str]]:
     return [{"sector": key, "url": url} for key, url in AP_HUBS.items()]
 
 
-def fetch_raw_events(category: str | None = None, limit_per_category: int = 10) -> list[RawEvent]:
+@dataclass
+class _FeedState:
+    # Validators and built events of the last successful fetch of one hub.
+    # `parsed` counts the feed items read, before any were skipped.
+    # `complete` is False when already-stored items were skipped while
+    # building, so the events can't stand in for the feed.
+    etag: str = ""
+    last_modified: str = ""
+    content_hash: str = ""
+    limit: int = 0
+    parsed: int = 0
+    events: list[RawEvent] = field(default_factory=list)
+    complete: bool = True
+
+
+_feed_cache: dict[str, _FeedState] = {}
+_feed_cache_lock = threading.Lock()
+
+
+def fetch_raw_events(
+    category: str | None = None, limit_per_category: int = 10, changed_only: bool = False
+) -> tuple[list[RawEvent], dict[str, _FeedState]]:
+    # Hubs answering 304, or returning a body identical to the cached one,
+    # are not parsed again: their cached events are reused, or left out
+    # entirely when changed_only is set (ingest only wants new material).
+    # changed_only also drops items the seen-id filter knows are stored,
+    # before any model is built.
+    # The new feed states are returned rather than cached: the caller passes
+    # them to remember_feeds once the events are stored, so a failed save
+    # doesn't leave the hub looking unchanged on the next poll.
     events: list[RawEvent] = []
+    states: dict[str, _FeedState] = {}
     hubs = _filtered_hubs(category)
+    seen = get_seen_ids() if changed_only else None
+    feeds = _fetch_hubs(hubs, limit_per_category, changed_only)
+    # Results are consumed in AP_HUBS order regardless of completion order.
     for key, hub_url in hubs.items():
-        try:
-            rss_xml = _fetch_text(hub_url)
-        except requests.RequestException as exc:
-            logger.warning("AP hub fetch failed %s error=%s", hub_url, exc)
+        if key not in feeds:
             continue
-        items = _parse_rss_items(rss_xml)[:limit_per_category]
-        logger.info("AP hub %s items=%s", key, len(items))
-        for item in items:
-            url = item.get("url", "")
-            title = item.get("title", "")
-            published_at = item.get("published_at", "")
-            summary = item.get("summary", "")
-            if not url:
-                continue
-            published = _parse_datetime(published_at) or datetime.utcnow()
-            event_id = _stable_id(title or "", url, published)
-            raw_payload = {
-                "category_url": hub_url,
-                "item": {"title": title, "url": url, "published_at": published_at},
-                "details": {"title": title, "summary": summary, "text": ""},
-            }
-            events.append(
-                RawEvent(
-                    id=event_id,
-                    title=(title or _title_from_url(url)).strip(),
-                    url=url,
-                    published_at=published,
-                    sector=SECTOR_MAP.get(key, key),
-                    source="apnews",
-                    payload=raw_payload,
-                )
+        fetched = feeds[key]
+        if fetched is None:
+            logger.info("AP hub %s unchanged", key)
+            if not changed_only:
+                events.extend(_feed_cache[hub_url].events[:limit_per_category])
+            continue
+        items, state = fetched
+        state.limit = limit_per_category
+        state.events = _hub_events(key, hub_url, items, seen)
+        state.complete = seen is None
+        states[hub_url] = state
+        events.extend(state.events)
+    return events, states
+
+
+def remember_feeds(states: dict[str, _FeedState]) -> None:
+    if not settings.feed_conditional_get:
+        return
+    with _feed_cache_lock:
+        _feed_cache.update(states)
+
+
+def _hub_events(
+    key: str, hub_url: str, items: list[dict[str, str]], seen: SeenIds | None = None
+) -> list[RawEvent]:
+    events: list[RawEvent] = []
+    skipped = 0
+    for item in items:
+        url = item.get("url", "")
+        title = item.get("title", "")
+        published_at = item.get("published_at", "")
+        summary = item.get("summary", "")
+        if not url:
+            continue
+        published = _parse_datetime(published_at) or datetime.utcnow()
+        event_id = _stable_id(title or "", url, published)
+        if seen is not None and event_id in seen:
+            skipped += 1
+            continue
+        raw_payload = {
+            "category_url": hub_url,
+            "item": {"title": title, "url": url, "published_at": published_at},
+            "details": {"title": title, "summary": summary, "text": ""},
+        }
+        events.append(
+            RawEvent(
+                id=event_id,
+                title=(title or _title_from_url(url)).strip(),
+                url=url,
+                published_at=published,
+                sector=SECTOR_MAP.get(key, key),
+                source="apnews",
+                payload=raw_payload,
             )
+        )
+    logger.info("AP hub %s items=%s seen=%s", key, len(items), skipped)
     return events
 
 
 def fetch_article_details(url: str) -> dict[str, str]:
     article_html = _fetch_text(url)
-    title, published_at, body, summary = _extract_article(article_html)
+    title, published_at, body, summary = extract_article(article_html)
     return {
         "title": title,
         "published_at": published_at,
@@ -103,11 +173,117 @@ def _filtered_hubs(category: str | None) -> dict[str, str]:
     return {}
 
 
-def _fetch_text(url: str) -> str:
-    response = requests.get(
+def _fetch_hubs(
+    hubs: dict[str, str], limit: int, changed_only: bool = False
+) -> dict[str, tuple[list[dict[str, str]], _FeedState] | None]:
+    # Fetches every hub concurrently so ingest takes as long as the slowest
+    # feed. Each host gets its own semaphore; a hub that failed, or is still
+    # queued or in flight at the overall deadline, is logged and left out.
+    # None marks a hub whose cached events are still current.
+    if not hubs:
+        return {}
+    deadline = time.monotonic() + settings.feed_deadline_sec
+    host_limits = {
+        host: threading.BoundedSemaphore(max(settings.feed_per_host_limit, 1))
+        for host in {urlsplit(url).netloc for url in hubs.values()}
+    }
+
+    def fetch(hub_url: str) -> tuple[list[dict[str, str]], _FeedState] | None | bool:
+        with host_limits[urlsplit(hub_url).netloc]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                return _fetch_feed(hub_url, limit, changed_only, timeout=min(settings.feed_timeout_sec, remaining))
+            except requests.RequestException as exc:
+                logger.warning("AP hub fetch failed %s error=%s", hub_url, exc)
+                return False
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(settings.feed_fetch_workers, len(hubs))), thread_name_prefix="feed-fetch"
+    )
+    try:
+        futures = {key: executor.submit(fetch, url) for key, url in hubs.items()}
+        wait(futures.values(), timeout=max(deadline - time.monotonic(), 0))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    feeds = {}
+    for key, future in futures.items():
+        if not future.done() or future.cancelled():
+            logger.warning("AP hub fetch missed deadline %s", hubs[key])
+            continue
+        fetched = future.result()
+        if fetched is not False:
+            feeds[key] = fetched
+    return feeds
+
+
+def _fetch_feed(
+    hub_url: str, limit: int, changed_only: bool, timeout: float
+) -> tuple[list[dict[str, str]], _FeedState] | None:
+    # Conditional GET against the cached validators. The cache only answers
+    # when it was built with at least `limit` items or already held the whole
+    # feed, and, unless the caller only wants changes, holds every item;
+    # otherwise the hub is fetched unconditionally.
+    cached = _feed_cache.get(hub_url) if settings.feed_conditional_get else None
+    if cached and cached.limit < limit and cached.parsed >= cached.limit:
+        cached = None
+    if cached and not cached.complete and not changed_only:
+        cached = None
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    # The body is parsed as it arrives and reading stops after `limit` items,
+    # so the hash covers the bytes consumed up to that point: equal hashes
+    # still mean equal leading items.
+    with http_client.get(hub_url, headers=headers, timeout=timeout, stream=True) as response:
+        if cached and response.status_code == 304:
+            return None
+        response.raise_for_status()
+        digest = hashlib.sha256()
+        chunks = _hashed(response.iter_content(_RSS_CHUNK_BYTES), digest)
+        items = list(islice(_iter_rss_items(chunks), limit))
+        _drain(response)
+    content_hash = digest.hexdigest()
+    if cached and content_hash == cached.content_hash:
+        return None
+    state = _FeedState(
+        etag=response.headers.get("ETag", ""),
+        last_modified=response.headers.get("Last-Modified", ""),
+        content_hash=content_hash,
+        parsed=len(items),
+    )
+    return items, state
+
+
+def _drain(response: requests.Response) -> None:
+    # Reads the unread remainder only when Content-Length shows it is small,
+    # so the keep-alive connection goes back to the pool. A larger or unknown
+    # remainder is left unread and the connection is dropped when the
+    # response closes, keeping the early stop cheap.
+    length = response.headers.get("Content-Length", "")
+    if not length.isdigit():
+        return
+    remaining = int(length) - response.raw.tell()
+    if 0 < remaining <= _RSS_DRAIN_BYTES:
+        for _ in response.iter_content(_RSS_CHUNK_BYTES):
+            pass
+
+
+def _hashed(chunks: Iterable[bytes], digest: Any) -> Iterator[bytes]:
+    for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+
+def _fetch_text(url: str, timeout: float = 20) -> str:
+    response = http_client.get(
         url,
         headers={"User-Agent": "Mozilla/5.0"},
-        timeout=20,
+        timeout=timeout,
     )
     response.raise_for_status()
     return response.text
@@ -132,32 +308,56 @@ def _extract_article_meta_from_hub(html: str, url: str) -> tuple[str, str]:
     if not match:
         return "", ""
     anchor = match.group(1)
-    title = _strip_html(anchor)
+    title = strip_html(anchor)
     return title, ""
 
 
-def _parse_rss_items(xml_text: str) -> list[dict[str, str]]:
-    items: list[dict[str, str]] = []
+_RSS_CHUNK_BYTES = 16384
+_RSS_DRAIN_BYTES = 32768
+
+
+def _parse_rss_items(xml_text: str | bytes, limit: int | None = None) -> list[dict[str, str]]:
+    return list(islice(_iter_rss_items([xml_text]), limit))
+
+
+def _iter_rss_items(chunks: Iterable[str | bytes]) -> Iterator[dict[str, str]]:
+    # Incremental parse: each <item> is yielded as soon as it closes and then
+    # detached from the tree, so memory holds one item at a time and a
+    # consumer that stops early leaves the rest of the stream unread.
+    # Malformed input ends the stream after the last complete item.
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    open_elements: list[ElementTree.Element] = []
     try:
-        root = ElementTree.fromstring(xml_text)
-    except ElementTree.ParseError:
-        return items
-    for item in root.findall(".//item"):
-        title = _text_or_empty(item.find("title"))
-        link = _text_or_empty(item.find("link"))
-        pub_date = _text_or_empty(item.find("pubDate"))
-        description = _text_or_empty(item.find("description"))
-        summary = _strip_html(description)
-        if link:
-            items.append(
-                {
-                    "title": title,
-                    "url": link,
-                    "published_at": pub_date,
-                    "summary": summary,
-                }
-            )
-    return items
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == "start":
+                    open_elements.append(element)
+                    continue
+                open_elements.pop()
+                if element.tag != "item":
+                    continue
+                item = _rss_item(element)
+                if open_elements:
+                    open_elements[-1].remove(element)
+                element.clear()
+                if item:
+                    yield item
+        parser.close()
+    except ElementTree.ParseError as exc:
+        logger.warning("RSS parse stopped error=%s", exc)
+
+
+def _rss_item(item: ElementTree.Element) -> dict[str, str] | None:
+    link = _text_or_empty(item.find("link"))
+    if not link:
+        return None
+    return {
+        "title": _text_or_empty(item.find("title")),
+        "url": link,
+        "published_at": _text_or_empty(item.find("pubDate")),
+        "summary": strip_html(_text_or_empty(item.find("description"))),
+    }
 
 
 def _text_or_empty(node: ElementTree.Element | None) -> str:
@@ -166,51 +366,6 @@ def _text_or_empty(node: ElementTree.Element | None) -> str:
     return node.text.strip()
 
 
-
-
-def _extract_article(html: str) -> tuple[str, str, str, str]:
-    title = _extract_meta(html, "property", "og:title") or _extract_title(html)
-    summary = _extract_meta(html, "property", "og:description") or ""
-    published = (
-        _extract_meta(html, "property", "article:published_time")
-        or _extract_meta(html, "name", "pubdate")
-        or ""
-    )
-    body = _extract_paragraphs(html)
-    if not body:
-        body = summary
-    return title, published, body, summary
-
-
-def _extract_meta(html: str, attr: str, value: str) -> str:
-    pattern = rf'<meta[^>]+{attr}="{re.escape(value)}"[^>]+content="([^"]+)"'
-    match = re.search(pattern, html, flags=re.IGNORECASE)
-    return unescape(match.group(1)).strip() if match else ""
-
-
-def _extract_title(html: str) -> str:
-    match = re.search(r"<title>([^<]+)</title>", html, flags=re.IGNORECASE)
-    return unescape(match.group(1)).strip() if match else ""
-
-
-def _extract_paragraphs(html: str) -> str:
-    texts = []
-    for match in re.findall(r"<p[^>]*>(.*?)</p>", html, flags=re.IGNORECASE | re.DOTALL):
-        cleaned = _strip_html(match)
-        if cleaned:
-            texts.append(cleaned)
-    joined = " ".join(texts)
-    return joined[:4000]
-
-
-def _strip_html(text: str) -> str:
-    text = re.sub(r"<script[^>]*>.*?</script>", " ", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<style[^>]*>.*?</style>", " ", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return unescape(text)
-
-
 def _parse_datetime(value: Any) -> datetime | None:
     if not value:
         return None
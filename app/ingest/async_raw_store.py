@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from psycopg.rows import dict_row
+
+from app.ingest.raw_store import (
+    RAW_EVENT_DETAILS_SQL,
+    RAW_EVENT_SQL,
+    RAW_EVENT_WITH_DETAILS_SQL,
+    UNPROCESSED_RAW_EVENTS_SQL,
+    UNPROCESSED_RAW_EVENTS_WITH_DETAILS_SQL,
+    _COPY_STAGE_SQL,
+    _CREATE_STAGE_SQL,
+    _ENSURE_STAGE_PARTITIONS_SQL,
+    _MERGE_STAGE_SQL,
+    _raw_from_row,
+    _raw_params,
+)
+from app.models import RawEvent
+from app.store.db import async_connection
+
+
+async def save_raw_events(events: Iterable[RawEvent]) -> int:
+    batch = list(events)
+    if not batch:
+        return 0
+    async with async_connection() as conn:
+        cur = conn.cursor()
+        await cur.execute(_CREATE_STAGE_SQL)
+        async with cur.copy(_COPY_STAGE_SQL) as copy:
+            for event in batch:
+                await copy.write_row(_raw_params(event))
+        await cur.execute(_ENSURE_STAGE_PARTITIONS_SQL)
+        await cur.execute(_MERGE_STAGE_SQL)
+        count = int((await cur.fetchone())[0])
+    return count
+
+
+async def fetch_unprocessed_raw_events(limit: int = 200, include_details: bool = True) -> list[RawEvent]:
+    sql = UNPROCESSED_RAW_EVENTS_WITH_DETAILS_SQL if include_details else UNPROCESSED_RAW_EVENTS_SQL
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(sql, (limit,))
+        rows = await cur.fetchall()
+    return [_raw_from_row(row) for row in rows]
+
+
+async def fetch_raw_event(raw_event_id: str, include_details: bool = True) -> RawEvent | None:
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(RAW_EVENT_WITH_DETAILS_SQL if include_details else RAW_EVENT_SQL, (raw_event_id,))
+        row = await cur.fetchone()
+    return _raw_from_row(row) if row else None
+
+
+async def fetch_raw_event_details(raw_event_id: str) -> dict[str, Any] | None:
+    async with async_connection() as conn:
+        cur = conn.cursor()
+        await cur.execute(RAW_EVENT_DETAILS_SQL, (raw_event_id,))
+        row = await cur.fetchone()
+    return row[0] if row else None
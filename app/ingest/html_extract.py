@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+from html import unescape
+
+# Article extraction in a single scan. One precompiled alternation walks the
+# page once and picks up <meta> tags, the first <title> and <p> bodies in
+# document order. Paragraphs past the body cap are not cleaned, and the scan
+# stops early once the cap is filled and the preferred meta tags are found.
+# The <p> branch must match the whole tag name: a bare `<p` prefix also opens
+# on <path>, <pre> or <picture> and hides any <meta> before the next </p>.
+
+BODY_MAX_CHARS = 4000
+
+_SCAN_RE = re.compile(
+    r"<meta\b(?P<meta>[^>]*)>"
+    r"|<title>(?P<title>[^<]+)</title>"
+    r"|<p\b[^>]*>(?P<p>.*?)</p>",
+    re.IGNORECASE | re.DOTALL,
+)
+_ATTR_RE = re.compile(r'([\w:.-]+)\s*=\s*"([^"]*)"')
+_STRIP_RE = re.compile(
+    r"<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<[^>]+>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# (attribute, value) pairs looked up in <meta> tags.
+_META_KEYS = (
+    ("property", "og:title"),
+    ("property", "og:description"),
+    ("property", "article:published_time"),
+    ("name", "pubdate"),
+)
+_DECISIVE_KEYS = _META_KEYS[:3]
+
+
+def strip_html(text: str) -> str:
+    # Drops scripts, styles and tags in one pass, then collapses whitespace.
+    return unescape(" ".join(_STRIP_RE.sub(" ", text).split()))
+
+
+def extract_article(html: str) -> tuple[str, str, str, str]:
+    # Returns (title, published, body, summary); body falls back to the
+    # og:description summary when the page has no paragraph text.
+    meta: dict[tuple[str, str], str] = {}
+    title_tag = ""
+    paragraphs: list[str] = []
+    body_chars = 0
+    for match in _SCAN_RE.finditer(html):
+        kind = match.lastgroup
+        if kind == "meta":
+            _collect_meta(match.group("meta"), meta)
+        elif kind == "title":
+            if not title_tag:
+                title_tag = unescape(match.group("title")).strip()
+        elif body_chars <= BODY_MAX_CHARS:
+            cleaned = strip_html(match.group("p"))
+            if cleaned:
+                paragraphs.append(cleaned)
+                body_chars += len(cleaned) + 1
+        elif all(key in meta for key in _DECISIVE_KEYS):
+            break
+
+    title = meta.get(("property", "og:title")) or title_tag
+    summary = meta.get(("property", "og:description")) or ""
+    published = meta.get(("property", "article:published_time")) or meta.get(("name", "pubdate")) or ""
+    body = " ".join(paragraphs)[:BODY_MAX_CHARS] or summary
+    return title, published, body, summary
+
+
+def _collect_meta(attributes: str, meta: dict[tuple[str, str], str]) -> None:
+    attrs = {name.lower(): value for name, value in _ATTR_RE.findall(attributes)}
+    content = unescape(attrs.get("content", "")).strip()
+    if not content:
+        return
+    for key in _META_KEYS:
+        attr, value = key
+        if key not in meta and attrs.get(attr, "").lower() == value:
+            meta[key] = content
@@ -10,6 +10,7 @@ from typing import Any
 import requests
 from dateutil import parser as date_parser
 
+from app import http_client
 from app.config import settings
 from app.models import RawEvent
 
@@ -122,7 +123,7 @@ def fetch_raw_events(category: str | None = None, limit_per_category: int = 10)
         url = f"{settings.rapidapi_base_url}{endpoint['path']}"
         params = endpoint.get("params")
         logger.info("RapidAPI request: %s params=%s", url, params)
-        response = requests.get(
+        response = http_client.get(
             url,
             headers=headers,
             params=params,
@@ -247,7 +248,7 @@ def _fetch_details(headers: dict[str, str], link: str | None) -> dict[str, Any]:
     url = f"{settings.rapidapi_base_url}/details"
     logger.info("RapidAPI details: %s params=%s", url, {"url": link})
     try:
-        response = requests.get(
+        response = http_client.get(
             url,
             headers=headers,
             params={"url": link},
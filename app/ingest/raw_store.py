@@ -1,85 +1,173 @@
 from __future__ import annotations
 
 import json
-from typing import Iterable
+from typing import Any, Iterable, Iterator
 
 from psycopg.rows import dict_row
 
 from app.models import RawEvent
-from app.store.db import get_db
+from app.store.db import connection, iter_batches
+
+
+_CREATE_STAGE_SQL = """
+CREATE TEMP TABLE raw_events_stage
+(LIKE raw_events INCLUDING DEFAULTS, details JSONB)
+ON COMMIT DROP
+"""
+
+_COPY_STAGE_SQL = "COPY raw_events_stage (id, title, url, published_at, sector, source, payload, details) FROM STDIN"
+
+# Make sure every month in the batch has its partitions before merging.
+_ENSURE_STAGE_PARTITIONS_SQL = """
+SELECT ensure_event_partitions(month)
+FROM (SELECT DISTINCT date_trunc('month', published_at, 'UTC') AS month FROM raw_events_stage) months
+"""
+
+# Unique keys on the partitioned table include published_at, so ids already
+# stored in any partition are filtered out explicitly. Bodies go to
+# raw_event_content only for rows that were actually new; the final count is
+# the exact number of new raw events.
+_MERGE_STAGE_SQL = """
+WITH inserted AS (
+    INSERT INTO raw_events
+    (id, title, url, published_at, sector, source, payload)
+    SELECT DISTINCT ON (s.id) s.id, s.title, s.url, s.published_at, s.sector, s.source, s.payload
+    FROM raw_events_stage s
+    WHERE NOT EXISTS (SELECT 1 FROM raw_events r WHERE r.id = s.id)
+    ORDER BY s.id
+    ON CONFLICT (id, published_at) DO NOTHING
+    RETURNING id, published_at
+),
+content AS (
+    INSERT INTO raw_event_content (raw_event_id, published_at, details)
+    SELECT DISTINCT ON (s.id) s.id, s.published_at, s.details
+    FROM raw_events_stage s
+    JOIN inserted i ON i.id = s.id AND i.published_at = s.published_at
+    WHERE s.details IS NOT NULL
+    ORDER BY s.id
+    ON CONFLICT (raw_event_id, published_at) DO NOTHING
+)
+SELECT COUNT(*) FROM inserted
+"""
+
+_RAW_COLUMNS = "r.id, r.title, r.url, r.published_at, r.sector, r.source, r.payload"
+_DETAILS_JOIN = "LEFT JOIN raw_event_content c ON c.raw_event_id = r.id AND c.published_at = r.published_at"
+
+RAW_EVENT_SQL = f"SELECT {_RAW_COLUMNS} FROM raw_events r WHERE r.id = %s"
+RAW_EVENT_WITH_DETAILS_SQL = f"SELECT {_RAW_COLUMNS}, c.details FROM raw_events r {_DETAILS_JOIN} WHERE r.id = %s"
+RAW_EVENT_DETAILS_SQL = "SELECT details FROM raw_event_content WHERE raw_event_id = %s"
+RAW_EVENT_DETAILS_MANY_SQL = "SELECT raw_event_id, details FROM raw_event_content WHERE raw_event_id = ANY(%s)"
+
+
+def _raw_params(event: RawEvent) -> tuple[object, ...]:
+    payload = dict(event.payload)
+    details = payload.pop("details", None)
+    return (
+        event.id,
+        event.title,
+        event.url,
+        event.published_at,
+        event.sector,
+        event.source,
+        json.dumps(payload, ensure_ascii=True),
+        json.dumps(details, ensure_ascii=True) if details is not None else None,
+    )
 
 
 def save_raw_events(events: Iterable[RawEvent]) -> int:
-    conn = get_db()
-    cur = conn.cursor()
-    count = 0
-
-    for event in events:
-        cur.execute(
-            """
-            INSERT INTO raw_events
-            (id, title, url, published_at, sector, source, payload)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            """,
-            (
-                event.id,
-                event.title,
-                event.url,
-                event.published_at,
-                event.sector,
-                event.source,
-                json.dumps(event.payload, ensure_ascii=True),
-            ),
-        )
-        if cur.rowcount:
-            count += 1
-
-    conn.commit()
-    conn.close()
+    # COPY the batch into a transaction-scoped staging table, then merge it in
+    # one statement so the batch costs a fixed number of round-trips.
+    batch = list(events)
+    if not batch:
+        return 0
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(_CREATE_STAGE_SQL)
+        with cur.copy(_COPY_STAGE_SQL) as copy:
+            for event in batch:
+                copy.write_row(_raw_params(event))
+        cur.execute(_ENSURE_STAGE_PARTITIONS_SQL)
+        cur.execute(_MERGE_STAGE_SQL)
+        count = int(cur.fetchone()[0])
     return count
 
 
-def fetch_unprocessed_raw_events(limit: int = 200) -> list[RawEvent]:
-    conn = get_db()
-    cur = conn.cursor(row_factory=dict_row)
-    cur.execute(
-        """
-        SELECT r.* FROM raw_events r
-        LEFT JOIN normalized_events n ON n.raw_event_id::text = r.id
-        WHERE n.raw_event_id IS NULL
-        ORDER BY r.published_at DESC
-        LIMIT %s
-        """,
-        (limit,),
-    )
-    rows = cur.fetchall()
-    conn.close()
-
-    events: list[RawEvent] = []
-    for row in rows:
-        events.append(
-            RawEvent(
-                id=row["id"],
-                title=row["title"],
-                url=row["url"],
-                published_at=row["published_at"],
-                sector=row["sector"],
-                source=row["source"],
-                payload=row["payload"],
-            )
-        )
+_UNPROCESSED_SQL = """
+SELECT {columns} FROM raw_events r
+{join}
+WHERE r.state = 'ingested'
+ORDER BY r.published_at DESC, r.id DESC
+LIMIT %s
+"""
+
+UNPROCESSED_RAW_EVENTS_SQL = _UNPROCESSED_SQL.format(columns=_RAW_COLUMNS, join="")
+UNPROCESSED_RAW_EVENTS_WITH_DETAILS_SQL = _UNPROCESSED_SQL.format(columns=f"{_RAW_COLUMNS}, c.details", join=_DETAILS_JOIN)
+
+BACKLOG_STATES = ("ingested", "normalizing", "normalized", "failed")
+
+
+def fetch_unprocessed_raw_events(limit: int = 200, include_details: bool = True) -> list[RawEvent]:
+    sql = UNPROCESSED_RAW_EVENTS_WITH_DETAILS_SQL if include_details else UNPROCESSED_RAW_EVENTS_SQL
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(sql, (limit,))
+        rows = cur.fetchall()
+    return [_raw_from_row(row) for row in rows]
+
+
+def iter_unprocessed_raw_events(limit: int = 200, include_details: bool = True) -> Iterator[RawEvent]:
+    # Same rows as fetch_unprocessed_raw_events, read through a server-side
+    # cursor so large limits never materialize in memory.
+    sql = UNPROCESSED_RAW_EVENTS_WITH_DETAILS_SQL if include_details else UNPROCESSED_RAW_EVENTS_SQL
+    for rows in iter_batches(sql, (limit,), row_factory=dict_row):
+        for row in rows:
+            yield _raw_from_row(row)
+
+
+def fetch_raw_event(raw_event_id: str, include_details: bool = True) -> RawEvent | None:
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(RAW_EVENT_WITH_DETAILS_SQL if include_details else RAW_EVENT_SQL, (raw_event_id,))
+        row = cur.fetchone()
+    return _raw_from_row(row) if row else None
+
+
+def fetch_raw_event_details(raw_event_id: str) -> dict[str, Any] | None:
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(RAW_EVENT_DETAILS_SQL, (raw_event_id,))
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+RECENT_RAW_EVENT_IDS_SQL = "SELECT id FROM raw_events ORDER BY published_at DESC, id DESC LIMIT %s"
+
+
+def recent_raw_event_ids(limit: int) -> list[str]:
+    # Newest first; warms the ingest seen-id filter.
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(RECENT_RAW_EVENT_IDS_SQL, (limit,))
+        return [row[0] for row in cur.fetchall()]
+
+
+def attach_details(events: list[RawEvent]) -> list[RawEvent]:
+    # Lazily load bodies for events fetched without them, in one round-trip.
+    missing = {event.id: event for event in events if "details" not in event.payload}
+    if not missing:
+        return events
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(RAW_EVENT_DETAILS_MANY_SQL, (list(missing),))
+        for raw_event_id, details in cur.fetchall():
+            missing[raw_event_id].payload["details"] = details
     return events
 
 
-def fetch_raw_event(raw_event_id: str) -> RawEvent | None:
-    conn = get_db()
-    cur = conn.cursor(row_factory=dict_row)
-    cur.execute("SELECT * FROM raw_events WHERE id = %s", (raw_event_id,))
-    row = cur.fetchone()
-    conn.close()
-    if not row:
-        return None
+def _raw_from_row(row: dict[str, Any]) -> RawEvent:
+    payload = dict(row["payload"] or {})
+    if row.get("details") is not None:
+        payload["details"] = row["details"]
     return RawEvent(
         id=row["id"],
         title=row["title"],
@@ -87,5 +175,16 @@ def fetch_raw_event(raw_event_id: str) -> RawEvent | None:
         published_at=row["published_at"],
         sector=row["sector"],
         source=row["source"],
-        payload=row["payload"],
+        payload=payload,
     )
+
+
+def backlog_counts() -> dict[str, int]:
+    # One count per state so each is answered from that state's partial index.
+    counts: dict[str, int] = {}
+    with connection() as conn:
+        cur = conn.cursor()
+        for state in BACKLOG_STATES:
+            cur.execute("SELECT COUNT(*) FROM raw_events WHERE state = %s", (state,))
+            counts[state] = int(cur.fetchone()[0])
+    return counts
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+from app.config import settings
+from app.store.backend import get_backend
+
+logger = logging.getLogger("app.ingest")
+
+
+class SeenIds:
+    # Bounded LRU of raw event ids known to be stored. Exact rather than a
+    # Bloom filter: a false positive would silently drop a new article.
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._ids: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, raw_event_id: object) -> bool:
+        with self._lock:
+            if raw_event_id not in self._ids:
+                return False
+            self._ids.move_to_end(raw_event_id)  # type: ignore[arg-type]
+            return True
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add_many(self, raw_event_ids: Iterable[str]) -> None:
+        with self._lock:
+            for raw_event_id in raw_event_ids:
+                self._ids[raw_event_id] = None
+                self._ids.move_to_end(raw_event_id)
+            while len(self._ids) > self.capacity:
+                self._ids.popitem(last=False)
+
+
+_seen: SeenIds | None = None
+_seen_lock = threading.Lock()
+
+
+def get_seen_ids() -> SeenIds | None:
+    # Warmed on first use from the newest stored rows, oldest first so the
+    # newest end up most recently used.
+    global _seen
+    if settings.seen_ids_capacity <= 0:
+        return None
+    if _seen is None:
+        with _seen_lock:
+            if _seen is None:
+                seen = SeenIds(settings.seen_ids_capacity)
+                seen.add_many(reversed(get_backend().recent_raw_event_ids(settings.seen_ids_capacity)))
+                logger.info("Seen-id filter warmed ids=%s", len(seen))
+                _seen = seen
+    return _seen
+
+
+def mark_seen(raw_event_ids: Iterable[str]) -> None:
+    seen = get_seen_ids()
+    if seen is not None:
+        seen.add_many(raw_event_ids)
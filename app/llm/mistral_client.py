@@ -4,8 +4,7 @@ import json
 import time
 from typing import Any
 
-import requests
-
+from app import http_client
 from app.config import settings
 import logging
 
@@ -36,7 +35,7 @@ class MistralClient:
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
         start = time.perf_counter()
-        response = requests.post(url, json=payload, timeout=self.timeout, headers=headers)
+        response = http_client.post(url, json=payload, timeout=self.timeout, headers=headers)
         response.raise_for_status()
         elapsed_sec = time.perf_counter() - start
         logger.info(
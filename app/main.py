@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+import json
 import logging
+from datetime import datetime
+from typing import Any, Iterable
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
+from app import http_client
 from app.config import settings
-from app.ingest.raw_store import fetch_raw_event, fetch_unprocessed_raw_events, save_raw_events
-from app.ingest.apnews import fetch_article_details, fetch_raw_events, get_categories
+from app.ingest.apnews import fetch_article_details, fetch_raw_events, get_categories, remember_feeds
+from app.ingest.seen import mark_seen
 from app.llm.normalize import normalize_event
 from app.llm.insight import (
     build_analysis_reason,
@@ -20,18 +26,10 @@ from app.llm.insight import (
     summarize_news_ko,
 )
 from app.rules.engine import score_event
-from app.store.db import init_db
-from app.store.event_store import (
-    fetch_unscored_events,
-    fetch_normalized_event,
-    fetch_scored_event,
-    graph_edges,
-    list_timeline,
-    reset_scored_data,
-    save_normalized,
-    save_scored,
-    sector_heatmap,
-)
+from app.store.backend import close_backend, get_backend
+from app.store.event_store import decode_cursor
+from app.store.export import stream_export
+from app.store.work_queue import NORMALIZE_STAGE, SCORE_STAGE
 
 app = FastAPI(title="Event-FX-Sector Intelligence")
 
@@ -46,10 +44,19 @@ app.mount("/static", StaticFiles(directory="app/ui"), name="static")
 
 @app.on_event("startup")
 def _startup() -> None:
-    init_db()
+    store = get_backend()
+    store.init()
+    logger.info("Storage backend: %s", store.name)
     logger.info("Server running at http://localhost:8010")
 
 
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    await get_backend().aclose()
+    close_backend()
+    http_client.close_session()
+
+
 @app.get("/")
 def index() -> FileResponse:
     return FileResponse("app/ui/index.html")
@@ -68,11 +75,13 @@ def categories() -> list[dict[str, str]]:
 @app.get("/news")
 def news(category: str, limit: int = 10) -> list[dict[str, str]]:
     try:
-        events = fetch_raw_events(category=category, limit_per_category=limit)
+        events, feed_states = fetch_raw_events(category=category, limit_per_category=limit)
     except Exception as exc:
         logger.exception("News fetch failed")
         raise HTTPException(status_code=500, detail=str(exc))
-    save_raw_events(events)
+    get_backend().save_raw_events(events)
+    mark_seen(event.id for event in events)
+    remember_feeds(feed_states)
     response = []
     for event in events:
         summary = _news_summary(event.payload)
@@ -94,35 +103,29 @@ def news(category: str, limit: int = 10) -> list[dict[str, str]]:
 @app.post("/ingest/run")
 def ingest_run(category: str | None = None, limit_per_category: int = 10) -> dict[str, int]:
     try:
-        events = fetch_raw_events(category=category, limit_per_category=limit_per_category)
+        events, feed_states = fetch_raw_events(
+            category=category, limit_per_category=limit_per_category, changed_only=True
+        )
     except Exception as exc:
         logger.exception("Ingestion failed")
         raise HTTPException(status_code=500, detail=str(exc))
-    inserted = save_raw_events(events)
+    inserted = get_backend().save_raw_events(events)
+    mark_seen(event.id for event in events)
+    remember_feeds(feed_states)
     logger.info("Ingestion complete fetched=%s inserted=%s", len(events), inserted)
     return {"fetched": len(events), "inserted": inserted}
 
 
 @app.post("/events/normalize")
 def normalize_events(limit: int = 50) -> dict[str, int]:
-    raw_events = fetch_unprocessed_raw_events(limit=limit)
-    count = 0
-    for raw in raw_events:
-        normalized = normalize_event(raw)
-        save_normalized(normalized)
-        count += 1
+    count = _normalize_claimed(limit)
     logger.info("Normalization complete normalized=%s", count)
     return {"normalized": count}
 
 
 @app.post("/events/score")
 def score_events(limit: int = 50) -> dict[str, int]:
-    normalized_events = fetch_unscored_events(limit=limit)
-    count = 0
-    for normalized in normalized_events:
-        scored = score_event(normalized)
-        save_scored(scored)
-        count += 1
+    count = _score_claimed(limit)
     logger.info("Scoring complete scored=%s", count)
     return {"scored": count}
 
@@ -130,25 +133,18 @@ def score_events(limit: int = 50) -> dict[str, int]:
 @app.post("/pipeline/run")
 def pipeline_run(category: str | None = None, limit_per_category: int = 10, limit: int = 50) -> dict[str, int]:
     try:
-        events = fetch_raw_events(category=category, limit_per_category=limit_per_category)
+        events, feed_states = fetch_raw_events(
+            category=category, limit_per_category=limit_per_category, changed_only=True
+        )
     except Exception as exc:
         logger.exception("Pipeline ingestion failed")
         raise HTTPException(status_code=500, detail=str(exc))
-    inserted = save_raw_events(events)
+    inserted = get_backend().save_raw_events(events)
+    mark_seen(event.id for event in events)
+    remember_feeds(feed_states)
 
-    raw_events = fetch_unprocessed_raw_events(limit=limit)
-    normalized_count = 0
-    for raw in raw_events:
-        normalized = normalize_event(raw)
-        save_normalized(normalized)
-        normalized_count += 1
-
-    normalized_events = fetch_unscored_events(limit=limit)
-    scored_count = 0
-    for normalized in normalized_events:
-        scored = score_event(normalized)
-        save_scored(scored)
-        scored_count += 1
+    normalized_count = _normalize_claimed(limit)
+    scored_count = _score_claimed(limit)
 
     logger.info(
         "Pipeline complete fetched=%s inserted=%s normalized=%s scored=%s",
@@ -165,63 +161,166 @@ def pipeline_run(category: str | None = None, limit_per_category: int = 10, limi
     }
 
 
+@app.get("/pipeline/backlog")
+def pipeline_backlog() -> dict[str, int]:
+    return get_backend().backlog_counts()
+
+
 @app.post("/pipeline/run_one")
-def pipeline_run_one(raw_event_id: str) -> dict[str, int]:
-    raw_event = fetch_raw_event(raw_event_id)
-    if not raw_event:
+def pipeline_run_one(raw_event_id: str, force: bool = False) -> dict[str, int]:
+    # Only this event's rows are written; the upserts keep sector_totals and
+    # the work queue in step. Without force, stages that already have a
+    # result are reused, so the LLM is called only when nothing is stored yet.
+    store = get_backend()
+    bundle = store.fetch_event_bundle(raw_event_id)
+    if not bundle:
         raise HTTPException(status_code=404, detail="Raw event not found")
-    reset_scored_data()
-    try:
-        details = fetch_article_details(raw_event.url)
-    except Exception as exc:
-        logger.warning("AP article details fetch failed: %s", exc)
-        details = {}
-    if details:
-        raw_event.payload["details"] = {
-            "title": details.get("title", ""),
-            "summary": details.get("summary", ""),
-            "text": details.get("text", ""),
-        }
-        if details.get("published_at"):
-            raw_event.payload["item"]["published_at"] = details.get("published_at", "")
-        if details.get("title"):
-            raw_event.title = details.get("title", raw_event.title)
-    normalized = normalize_event(raw_event)
-    save_normalized(normalized)
+    if bundle.scored and not force:
+        return {"normalized": 0, "scored": 0}
+
+    normalized = bundle.normalized if not force else None
+    normalized_count = 0
+    if normalized is None:
+        raw_event = bundle.raw
+        try:
+            details = fetch_article_details(raw_event.url)
+        except Exception as exc:
+            logger.warning("AP article details fetch failed: %s", exc)
+            details = {}
+        if details:
+            raw_event.payload["details"] = {
+                "title": details.get("title", ""),
+                "summary": details.get("summary", ""),
+                "text": details.get("text", ""),
+            }
+            if details.get("published_at"):
+                raw_event.payload["item"]["published_at"] = details.get("published_at", "")
+            if details.get("title"):
+                raw_event.title = details.get("title", raw_event.title)
+        normalized = normalize_event(raw_event)
+        store.save_normalized(normalized)
+        normalized_count = 1
     scored = score_event(normalized)
-    save_scored(scored)
-    logger.info("Pipeline single complete raw_event_id=%s", raw_event_id)
-    return {"normalized": 1, "scored": 1}
+    store.save_scored(scored)
+    logger.info(
+        "Pipeline single complete raw_event_id=%s force=%s normalized=%s",
+        raw_event_id,
+        force,
+        normalized_count,
+    )
+    return {"normalized": normalized_count, "scored": 1}
 
 
 @app.get("/timeline")
-def timeline(limit: int = 50) -> list[dict[str, object]]:
-    return list_timeline(limit=limit)
+async def timeline(limit: int = 50, before: str | None = None, after: str | None = None) -> list[dict[str, object]]:
+    try:
+        return await get_backend().alist_timeline(limit=limit, before=before, after=after)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _ndjson(items: Iterable[Any]) -> StreamingResponse:
+    # One JSON document per line, written as each row leaves the cursor.
+    def lines() -> Iterable[str]:
+        for item in items:
+            if isinstance(item, BaseModel):
+                yield item.model_dump_json() + "\n"
+            else:
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _check_cursor(before: str | None) -> None:
+    # Streams fail after the status line is sent, so bad cursors are rejected
+    # up front.
+    if before:
+        try:
+            decode_cursor(before)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.get("/timeline/stream")
+def timeline_stream(limit: int = 50, before: str | None = None) -> StreamingResponse:
+    _check_cursor(before)
+    return _ndjson(get_backend().iter_timeline(limit=limit, before=before))
 
 
 @app.get("/heatmap")
-def heatmap() -> dict[str, float]:
-    return sector_heatmap()
+async def heatmap(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    sector: str | None = None,
+    event_type: str | None = None,
+) -> dict[str, float]:
+    return await get_backend().asector_heatmap(since=since, until=until, sector=sector, event_type=event_type)
 
 
 @app.get("/graph")
-def graph(limit: int = 100) -> list[dict[str, object]]:
-    return graph_edges(limit=limit)
+async def graph(limit: int = 100, before: str | None = None, after: str | None = None) -> list[dict[str, object]]:
+    try:
+        return await get_backend().agraph_edges(limit=limit, before=before, after=after)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.get("/graph/stream")
+def graph_stream(limit: int = 100, before: str | None = None) -> StreamingResponse:
+    _check_cursor(before)
+    return _ndjson(get_backend().iter_graph_edges(limit=limit, before=before))
+
+
+@app.get("/events/unprocessed/stream")
+def unprocessed_stream(limit: int = 200, include_details: bool = False) -> StreamingResponse:
+    return _ndjson(get_backend().iter_unprocessed_raw_events(limit=limit, include_details=include_details))
+
+
+@app.get("/events/bundles")
+async def event_bundles(ids: list[str] = Query(default=[])) -> list[dict[str, object]]:
+    if len(ids) > 500:
+        raise HTTPException(status_code=400, detail="At most 500 ids per request.")
+    bundles = await get_backend().afetch_event_bundles(ids)
+    return [bundle.model_dump(mode="json") for bundle in bundles]
+
+
+_EXPORT_MEDIA_TYPES = {"arrow": "application/vnd.apache.arrow.stream", "parquet": "application/vnd.apache.parquet"}
+
+
+@app.get("/export/{table}")
+def export_events(
+    table: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    fmt: str = Query(default="arrow", alias="format"),
+) -> StreamingResponse:
+    # Streams straight from a server-side cursor; nothing is held in memory
+    # beyond one record batch.
+    if get_backend().name != "postgres":
+        raise HTTPException(status_code=501, detail="Export requires the Postgres backend.")
+    try:
+        body = stream_export(table, since=since, until=until, fmt=fmt)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    suffix = "arrows" if fmt == "arrow" else "parquet"
+    return StreamingResponse(
+        body,
+        media_type=_EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{suffix}"'},
+    )
 
 
 @app.get("/events/insight")
-def event_insight(raw_event_id: str) -> dict[str, str]:
+async def event_insight(raw_event_id: str) -> dict[str, str]:
     import time
 
     start = time.perf_counter()
     logger.info("Insight request raw_event_id=%s", raw_event_id)
-    raw_event = fetch_raw_event(raw_event_id)
-    if not raw_event:
+    bundle = await get_backend().afetch_event_bundle(raw_event_id)
+    if not bundle:
         logger.warning("Insight missing raw_event_id=%s", raw_event_id)
         raise HTTPException(status_code=404, detail="Raw event not found")
-
-    normalized = fetch_normalized_event(raw_event_id)
-    scored = fetch_scored_event(raw_event_id)
+    raw_event, normalized, scored = bundle.raw, bundle.normalized, bundle.scored
     logger.info(
         "Insight data raw_event_id=%s normalized=%s scored=%s",
         raw_event_id,
@@ -229,19 +328,20 @@ def event_insight(raw_event_id: str) -> dict[str, str]:
         bool(scored),
     )
 
-    summary_ko = summarize_news_ko(raw_event)
+    # The LLM helpers do blocking HTTP, so keep them off the event loop.
+    summary_ko = await run_in_threadpool(summarize_news_ko, raw_event)
     if not summary_ko:
         summary_ko = _news_summary(raw_event.payload) or raw_event.title or "요약 정보가 없습니다."
 
-    analysis_reason = generate_analysis_ko(normalized, scored)
+    analysis_reason = await run_in_threadpool(generate_analysis_ko, normalized, scored)
     if not analysis_reason:
         analysis_reason = build_analysis_reason(normalized, scored)
 
-    fx_reason = generate_fx_ko(normalized, scored)
+    fx_reason = await run_in_threadpool(generate_fx_ko, normalized, scored)
     if not fx_reason:
         fx_reason = build_fx_reason(normalized, scored)
 
-    heatmap_reason = generate_heatmap_ko(scored, normalized)
+    heatmap_reason = await run_in_threadpool(generate_heatmap_ko, scored, normalized)
     if not heatmap_reason:
         heatmap_reason = build_heatmap_reason(scored, normalized)
 
@@ -259,6 +359,44 @@ def event_insight(raw_event_id: str) -> dict[str, str]:
     }
 
 
+def _normalize_claimed(limit: int) -> int:
+    # Leased jobs are acknowledged by the save; failures go back to the queue.
+    # Each LLM call can take up to llm_timeout_sec, so jobs are claimed in
+    # chunks that finish within one lease and each chunk is saved in one
+    # batch: a slow run is never re-claimed by another worker and a crash
+    # loses at most the chunk in progress.
+    # Claims return lean rows, so article bodies are attached per chunk.
+    store = get_backend()
+    chunk = max(1, settings.queue_lease_sec // max(settings.llm_timeout_sec, 1))
+    claimed_count = saved = 0
+    while claimed_count < limit:
+        claimed = store.claim_raw_events(limit=min(chunk, limit - claimed_count))
+        if not claimed:
+            break
+        claimed_count += len(claimed)
+        normalized = []
+        for raw in store.attach_details(claimed):
+            try:
+                normalized.append(normalize_event(raw))
+            except Exception as exc:
+                logger.warning("Normalization failed raw_event_id=%s error=%s", raw.id, exc)
+                store.release_jobs(NORMALIZE_STAGE, [raw.id], str(exc))
+        saved += store.save_normalized_many(normalized)
+    return saved
+
+
+def _score_claimed(limit: int) -> int:
+    store = get_backend()
+    scored = []
+    for normalized in store.claim_unscored_events(limit=limit):
+        try:
+            scored.append(score_event(normalized))
+        except Exception as exc:
+            logger.warning("Scoring failed raw_event_id=%s error=%s", normalized.raw_event_id, exc)
+            store.release_jobs(SCORE_STAGE, [normalized.raw_event_id], str(exc))
+    return store.save_scored_many(scored)
+
+
 def _news_summary(payload: dict) -> str:
     if not isinstance(payload, dict):
         return ""
@@ -50,3 +50,9 @@ class ScoredEvent(BaseModel):
     confidence: float = 0.6
     regime: dict[str, str] = Field(default_factory=dict)
     baseline: dict[str, float] = Field(default_factory=dict)
+
+
+class EventBundle(BaseModel):
+    raw: RawEvent
+    normalized: NormalizedEvent | None = None
+    scored: ScoredEvent | None = None
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from app.ingest.raw_store import (
+    BACKLOG_STATES,
+    UNPROCESSED_RAW_EVENTS_SQL,
+    UNPROCESSED_RAW_EVENTS_WITH_DETAILS_SQL,
+)
+from app.store.db import get_db
+from app.store.event_store import (
+    EVENT_BUNDLE_SQL,
+    EVENT_BUNDLES_SQL,
+    GRAPH_EDGES_SQL,
+    TIMELINE_SQL,
+    UNSCORED_EVENTS_SQL,
+    build_heatmap_query,
+    build_page_query,
+    encode_cursor,
+)
+from app.store.migrate import migrate
+from app.store.work_queue import (
+    CLAIM_NORMALIZED_EVENTS_SQL,
+    CLAIM_RAW_EVENTS_SQL,
+    NORMALIZE_STAGE,
+    SCORE_STAGE,
+    _claim_params,
+)
+
+SCRATCH_SCHEMA = "fim_plan_check"
+HOT_TABLES = {"raw_events", "normalized_events", "scored_events"}
+_PARTITION_RE = re.compile(r"_y\d{4}m\d{2}$")
+
+_CURSOR = encode_cursor(datetime.now(timezone.utc) - timedelta(days=30), "f" * 32)
+
+HOT_QUERIES: list[tuple[str, str, Any]] = [
+    ("list_timeline", *build_page_query(TIMELINE_SQL, 50)),
+    ("list_timeline before", *build_page_query(TIMELINE_SQL, 50, before=_CURSOR)),
+    ("list_timeline after", *build_page_query(TIMELINE_SQL, 50, after=_CURSOR)),
+    ("graph_edges", *build_page_query(GRAPH_EDGES_SQL, 100)),
+    ("graph_edges before", *build_page_query(GRAPH_EDGES_SQL, 100, before=_CURSOR)),
+    ("fetch_unprocessed_raw_events", UNPROCESSED_RAW_EVENTS_SQL, (200,)),
+    ("fetch_unprocessed_raw_events details", UNPROCESSED_RAW_EVENTS_WITH_DETAILS_SQL, (200,)),
+    ("fetch_unscored_events", UNSCORED_EVENTS_SQL, (200,)),
+    ("claim_raw_events", CLAIM_RAW_EVENTS_SQL, _claim_params(NORMALIZE_STAGE, 50, None)),
+    ("claim_unscored_events", CLAIM_NORMALIZED_EVENTS_SQL, _claim_params(SCORE_STAGE, 50, None)),
+    *[
+        (f"backlog_counts {state}", "SELECT COUNT(*) FROM raw_events WHERE state = %s", (state,))
+        for state in BACKLOG_STATES
+    ],
+    ("fetch_event_bundle", EVENT_BUNDLE_SQL, ("0" * 32,)),
+    ("fetch_event_bundles", EVENT_BUNDLES_SQL, ([f"{i:032x}" for i in range(50)],)),
+    ("sector_heatmap last 24h", *build_heatmap_query(since=datetime.now(timezone.utc) - timedelta(days=1))),
+    ("latest_created_at", "SELECT created_at FROM scored_events ORDER BY created_at DESC LIMIT 1", ()),
+]
+
+
+def seed(cur: Any, rows: int, backlog: int) -> None:
+    # Newest `backlog` raw events are un-normalized and the next `backlog`
+    # normalized events are unscored, mirroring a steady-state work queue.
+    # Triggers are bypassed while seeding; queue rows are written directly.
+    cur.execute("SET session_replication_role = replica")
+    cur.execute(
+        """
+        SELECT ensure_event_partitions(month)
+        FROM generate_series(now() - %s * interval '1 minute', now(), interval '1 month') month
+        UNION ALL
+        SELECT ensure_event_partitions(now())
+        """,
+        (rows,),
+    )
+    cur.execute(
+        """
+        INSERT INTO raw_events (id, title, url, published_at, sector, source, payload, state)
+        SELECT md5(g::text), 'seed ' || g, 'https://example.com/' || g,
+               now() - g * interval '1 minute', 'macro', 'seed', '{}'::jsonb,
+               CASE WHEN g <= %s THEN 'ingested' WHEN g <= %s THEN 'normalized' ELSE 'scored' END
+        FROM generate_series(1, %s::int) g
+        """,
+        (backlog, 2 * backlog, rows),
+    )
+    cur.execute(
+        """
+        INSERT INTO normalized_events
+        (raw_event_id, event_type, policy_domain, risk_signal, rate_signal, geo_signal, sector_impacts, sentiment,
+         rationale, channels, confidence, regime, baseline, normalized_at, published_at)
+        SELECT md5(g::text), 'seed', 'monetary', 'neutral', 'none', 'none', '{}'::jsonb, 'neutral',
+               '', '[]'::jsonb, 0.6, '{}'::jsonb, '{}'::jsonb, now() - g * interval '1 minute',
+               now() - g * interval '1 minute'
+        FROM generate_series(%s::int, %s::int) g
+        """,
+        (backlog + 1, rows),
+    )
+    cur.execute(
+        """
+        INSERT INTO scored_events
+        (raw_event_id, event_type, policy_domain, risk_signal, rate_signal, geo_signal, sector_impacts, sentiment,
+         rationale, fx_state, sector_scores, total_score, created_at, channels, confidence, regime, baseline,
+         sector_dict_version, sector_scores_vec, sector_impacts_vec, published_at)
+        SELECT md5(g::text), 'seed', 'monetary', 'neutral', 'none', 'none', '{}'::jsonb, 'neutral',
+               '', 'USD:+0 JPY:+0 EUR:+0 EM:+0', '{}'::jsonb, 1.0, now() - g * interval '1 minute',
+               '[]'::jsonb, 0.6, '{}'::jsonb, '{}'::jsonb, 1, '{NULL,NULL,NULL,1.0,NULL,NULL,NULL,NULL,NULL,NULL}',
+               '{}', now() - g * interval '1 minute'
+        FROM generate_series(%s::int, %s::int) g
+        """,
+        (2 * backlog + 1, rows),
+    )
+    cur.execute(
+        """
+        INSERT INTO work_queue (stage, raw_event_id, priority)
+        SELECT CASE WHEN g <= %s THEN 'normalize' ELSE 'score' END, md5(g::text), now() - g * interval '1 minute'
+        FROM generate_series(1, %s::int) g
+        """,
+        (backlog, 2 * backlog),
+    )
+    cur.execute("SET session_replication_role = DEFAULT")
+
+
+def seq_scans(plan: dict[str, Any], empty: set[str]) -> list[str]:
+    # Partitions report their own name; map them back to the parent table.
+    # Scanning an empty partition (e.g. next month's) costs nothing.
+    found = []
+    relation = plan.get("Relation Name", "")
+    if plan.get("Node Type") == "Seq Scan" and _PARTITION_RE.sub("", relation) in HOT_TABLES and relation not in empty:
+        found.append(relation)
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child, empty))
+    return found
+
+
+def check_plans(conn: Any, rows: int, backlog: int, keep: bool = False) -> dict[str, list[str]]:
+    # Returns, per hot query, the hot-table relations its plan scans
+    # sequentially. Runs in a scratch schema that is dropped unless `keep`.
+    cur = conn.cursor()
+    results: dict[str, list[str]] = {}
+    try:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {SCRATCH_SCHEMA}")
+        cur.execute(f"SET search_path TO {SCRATCH_SCHEMA}")
+        migrate(conn)
+        seed(cur, rows, backlog)
+        conn.commit()
+        for table in sorted(HOT_TABLES):
+            cur.execute(f"ANALYZE {table}")
+        cur.execute(
+            "SELECT relname FROM pg_class WHERE relnamespace = %s::regnamespace AND relkind = 'r' AND reltuples <= 0",
+            (SCRATCH_SCHEMA,),
+        )
+        empty = {name for (name,) in cur.fetchall()}
+
+        for name, sql, params in HOT_QUERIES:
+            cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cur.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            results[name] = seq_scans(plan[0]["Plan"], empty)
+    finally:
+        conn.rollback()
+        if not keep:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+            conn.commit()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Seed a scratch schema and fail if a hot query plans a sequential scan on a hot table."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Raw events to seed.")
+    parser.add_argument("--backlog", type=int, default=1_000, help="Unprocessed and unscored events to leave.")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema for inspection.")
+    args = parser.parse_args()
+
+    conn = get_db()
+    try:
+        results = check_plans(conn, args.rows, args.backlog, keep=args.keep)
+    finally:
+        conn.close()
+
+    failures = []
+    for name, scanned in results.items():
+        status = "FAIL seq scan on " + ", ".join(scanned) if scanned else "ok"
+        print(f"{name}: {status}")
+        if scanned:
+            failures.append(name)
+    if failures:
+        raise SystemExit(f"Sequential scans in: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
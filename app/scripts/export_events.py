@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.store.export import EXPORT_FORMATS, EXPORT_TABLES, export_to_directory
+
+
+def _utc(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export raw, normalized and scored events to monthly Parquet or Arrow IPC files."
+    )
+    parser.add_argument("--out", required=True, help="Output directory; files go to <table>/month=YYYY-MM/.")
+    parser.add_argument(
+        "--table",
+        action="append",
+        choices=EXPORT_TABLES,
+        help="Table to export; repeat for several. Defaults to all.",
+    )
+    parser.add_argument("--since", type=_utc, help="Inclusive lower bound on published_at (ISO 8601, UTC if naive).")
+    parser.add_argument("--until", type=_utc, help="Exclusive upper bound on published_at (ISO 8601, UTC if naive).")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet")
+    parser.add_argument(
+        "--batch-rows",
+        type=int,
+        default=settings.db_stream_batch_rows,
+        help="Rows fetched from the server-side cursor and written per record batch.",
+    )
+    args = parser.parse_args()
+
+    written = export_to_directory(
+        args.out,
+        tuple(args.table or EXPORT_TABLES),
+        since=args.since,
+        until=args.until,
+        fmt=args.format,
+        batch_rows=args.batch_rows,
+    )
+    for path, rows in written:
+        print(f"{path}: {rows} rows")
+    print(f"Wrote {len(written)} files, {sum(rows for _, rows in written)} rows.")
+
+
+if __name__ == "__main__":
+    main()
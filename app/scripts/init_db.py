@@ -2,32 +2,84 @@ from __future__ import annotations
 
 import argparse
 
-from app.store.db import get_db, init_db
+from app.store import sectors
+from app.store.db import get_db
+from app.store.migrate import current_version, load_migrations, migrate
 
 
 def drop_tables() -> None:
     conn = get_db()
     cur = conn.cursor()
+    cur.execute("DROP TABLE IF EXISTS work_queue")
+    cur.execute("DROP TABLE IF EXISTS sector_totals")
     cur.execute("DROP TABLE IF EXISTS scored_events")
     cur.execute("DROP TABLE IF EXISTS normalized_events")
+    cur.execute("DROP TABLE IF EXISTS raw_event_content")
     cur.execute("DROP TABLE IF EXISTS raw_events")
+    cur.execute("DROP TABLE IF EXISTS sector_dictionary")
+    cur.execute("DROP TABLE IF EXISTS schema_version")
+    cur.execute("DROP FUNCTION IF EXISTS apply_sector_totals_delta()")
+    cur.execute("DROP FUNCTION IF EXISTS enqueue_normalize_jobs()")
+    cur.execute("DROP FUNCTION IF EXISTS advance_normalized_job()")
+    cur.execute("DROP FUNCTION IF EXISTS complete_score_job()")
+    cur.execute("DROP FUNCTION IF EXISTS sector_scores_json(SMALLINT, REAL[], JSONB)")
+    cur.execute("DROP FUNCTION IF EXISTS ensure_event_partitions(TIMESTAMPTZ)")
+    cur.execute("DROP FUNCTION IF EXISTS event_partition_name(TEXT, TIMESTAMPTZ)")
     conn.commit()
     conn.close()
 
 
+def show_status() -> None:
+    conn = get_db()
+    version = current_version(conn)
+    # Dictionary v1 comes from migration 0006; a drifted ALL_SECTORS still
+    # works (a new version is registered) but the seed should be revisited.
+    drift = sectors.baseline_drift(conn) if version >= 6 else None
+    conn.close()
+    for migration in load_migrations():
+        state = "applied" if migration.version <= version else "pending"
+        print(f"{migration.version:04d}_{migration.name}: {state}")
+    print(f"Current schema version: {version}")
+    if version >= 6:
+        print(f"Sector dictionary v{sectors.BASELINE_VERSION}: {drift or 'matches ALL_SECTORS'}")
+    if drift:
+        raise SystemExit(1)
+
+
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Initialize Postgres schema.")
+    parser = argparse.ArgumentParser(description="Apply Postgres schema migrations.")
     parser.add_argument(
         "--drop",
         action="store_true",
         help="Drop existing tables before creating schema.",
     )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="List migrations and whether they are applied, then exit.",
+    )
+    parser.add_argument(
+        "--target",
+        type=int,
+        default=None,
+        help="Migrate up to this version instead of the latest.",
+    )
     args = parser.parse_args()
 
+    if args.status:
+        show_status()
+        return
+
     if args.drop:
         drop_tables()
 
-    init_db()
+    conn = get_db()
+    applied = migrate(conn, target=args.target)
+    version = current_version(conn)
+    conn.close()
+    for migration in applied:
+        print(f"Applied {migration.version:04d}_{migration.name}")
+    print(f"Schema version: {version}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+
+from app.config import settings
+from app.store.db import get_db
+from app.store.partitions import ensure_partitions, expired_months, partition_months, retire_month
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Pre-create upcoming monthly event partitions and retire months past the retention window."
+    )
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=settings.retention_months,
+        help="Keep this many whole months before the current one; 0 keeps everything.",
+    )
+    parser.add_argument(
+        "--premake-months",
+        type=int,
+        default=settings.partition_premake_months,
+        help="Create partitions this many months ahead of the current one.",
+    )
+    parser.add_argument(
+        "--archive-schema",
+        default=settings.retention_archive_schema,
+        help="Schema that detached partitions are moved to.",
+    )
+    parser.add_argument("--drop", action="store_true", help="Drop expired partitions instead of archiving them.")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would change.")
+    args = parser.parse_args()
+
+    conn = get_db()
+    try:
+        if not args.dry_run:
+            ensure_partitions(conn, args.premake_months)
+            conn.commit()
+        expired = expired_months(conn, args.retention_months)
+        for month in expired:
+            label = month.strftime("%Y-%m")
+            if args.dry_run:
+                print(f"Would {'drop' if args.drop else 'archive'} {label}")
+                continue
+            retire_month(conn, month, None if args.drop else args.archive_schema)
+            conn.commit()
+            print(f"{'Dropped' if args.drop else f'Archived to {args.archive_schema}'}: {label}")
+        months = partition_months(conn)
+    finally:
+        conn.rollback()
+        conn.close()
+
+    if months:
+        print(f"Live partitions: {months[0]:%Y-%m} .. {months[-1]:%Y-%m} ({len(months)} months)")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,9 +15,13 @@ def main() -> None:
     cur = conn.cursor()
     cur.execute("TRUNCATE scored_events")
     cur.execute("TRUNCATE normalized_events")
+    cur.execute("TRUNCATE sector_totals")
+    cur.execute("TRUNCATE work_queue")
+    cur.execute("INSERT INTO work_queue (stage, raw_event_id, priority) SELECT 'normalize', id, published_at FROM raw_events")
+    cur.execute("UPDATE raw_events SET state = 'ingested' WHERE state <> 'ingested'")
     conn.commit()
     conn.close()
-    print("Cleared normalized_events and scored_events.")
+    print("Cleared normalized_events, scored_events and sector_totals; re-queued raw events.")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
-import re
 import sys
 import uuid
 from datetime import datetime, timezone
-from html import unescape
 from pathlib import Path
 
 import requests
@@ -15,20 +13,13 @@ ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from app.ingest.html_extract import strip_html
 from app.llm.normalize import normalize_event
 from app.models import RawEvent
 
 TEST_URL = "https://apnews.com/article/banks-trump-jamie-dimon-jpmorgan-credit-cards-bny-b4f31993a64c31687c91f17beab0a98a"
 
 
-def _strip_html(text: str) -> str:
-    text = re.sub(r"<script[^>]*>.*?</script>", " ", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<style[^>]*>.*?</style>", " ", text, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return unescape(text)
-
-
 def _fetch_url_text(url: str) -> str:
     response = requests.get(
         url,
@@ -36,7 +27,7 @@ def _fetch_url_text(url: str) -> str:
         timeout=20,
     )
     response.raise_for_status()
-    return _strip_html(response.text)
+    return strip_html(response.text)
 
 
 def main() -> None:
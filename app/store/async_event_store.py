@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable
+
+from psycopg.rows import dict_row
+
+from app.models import EventBundle, NormalizedEvent, ScoredEvent
+from app.store import sectors
+from app.store.db import async_connection
+from app.store.event_store import (
+    EVENT_BUNDLE_SQL,
+    EVENT_BUNDLES_SQL,
+    GRAPH_EDGES_SQL,
+    TIMELINE_SQL,
+    UNSCORED_EVENTS_SQL,
+    _NORMALIZED_UPSERT,
+    _SCORED_UPSERT,
+    _bundle_from_row,
+    _bundle_sector_versions,
+    _bundles_in_order,
+    _graph_edges_from_rows,
+    _heatmap_from_rows,
+    _normalized_from_row,
+    _normalized_params,
+    _scored_from_row,
+    _scored_params,
+    _timeline_item,
+    build_heatmap_query,
+    build_page_query,
+)
+
+
+async def save_normalized(event: NormalizedEvent) -> None:
+    async with async_connection() as conn:
+        cur = conn.cursor()
+        await cur.execute(_NORMALIZED_UPSERT, _normalized_params(event))
+
+
+async def save_normalized_many(events: Iterable[NormalizedEvent]) -> int:
+    batch = [_normalized_params(event) for event in events]
+    if not batch:
+        return 0
+    async with async_connection() as conn:
+        cur = conn.cursor()
+        await cur.executemany(_NORMALIZED_UPSERT, batch)
+    return cur.rowcount
+
+
+async def fetch_unscored_events(limit: int = 200) -> list[NormalizedEvent]:
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(UNSCORED_EVENTS_SQL, (limit,))
+        rows = await cur.fetchall()
+    return [_normalized_from_row(row) for row in rows]
+
+
+async def fetch_normalized_event(raw_event_id: str) -> NormalizedEvent | None:
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute("SELECT * FROM normalized_events WHERE raw_event_id = %s", (raw_event_id,))
+        row = await cur.fetchone()
+    return _normalized_from_row(row) if row else None
+
+
+async def save_scored(event: ScoredEvent) -> None:
+    async with async_connection() as conn:
+        version = await sectors.async_ensure_dictionary(conn)
+        cur = conn.cursor()
+        await cur.execute(_SCORED_UPSERT, _scored_params(event, version))
+
+
+async def save_scored_many(events: Iterable[ScoredEvent]) -> int:
+    events = list(events)
+    if not events:
+        return 0
+    async with async_connection() as conn:
+        version = await sectors.async_ensure_dictionary(conn)
+        cur = conn.cursor()
+        await cur.executemany(_SCORED_UPSERT, [_scored_params(event, version) for event in events])
+    return cur.rowcount
+
+
+async def fetch_scored_event(raw_event_id: str) -> ScoredEvent | None:
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute("SELECT * FROM scored_events WHERE raw_event_id = %s", (raw_event_id,))
+        row = await cur.fetchone()
+        if row:
+            await sectors.async_ensure_dictionary(conn, [row["sector_dict_version"]])
+    return _scored_from_row(row) if row else None
+
+
+async def fetch_event_bundle(raw_event_id: str) -> EventBundle | None:
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(EVENT_BUNDLE_SQL, (raw_event_id,))
+        row = await cur.fetchone()
+        if row:
+            await sectors.async_ensure_dictionary(conn, _bundle_sector_versions([row]))
+    return _bundle_from_row(row) if row else None
+
+
+async def fetch_event_bundles(raw_event_ids: Iterable[str]) -> list[EventBundle]:
+    ids = list(dict.fromkeys(raw_event_ids))
+    if not ids:
+        return []
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(EVENT_BUNDLES_SQL, (ids,))
+        rows = await cur.fetchall()
+        await sectors.async_ensure_dictionary(conn, _bundle_sector_versions(rows))
+    return _bundles_in_order(ids, [_bundle_from_row(row) for row in rows])
+
+
+async def list_timeline(
+    limit: int = 50, before: str | None = None, after: str | None = None
+) -> list[dict[str, object]]:
+    sql, params = build_page_query(TIMELINE_SQL, limit, before, after)
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(sql, params)
+        rows = await cur.fetchall()
+    if after:
+        rows.reverse()
+    return [_timeline_item(row) for row in rows]
+
+
+async def sector_heatmap(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    sector: str | None = None,
+    event_type: str | None = None,
+) -> dict[str, float]:
+    sql, params = build_heatmap_query(since, until, sector, event_type)
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(sql, params)
+        rows = await cur.fetchall()
+    return _heatmap_from_rows(rows, sector)
+
+
+async def graph_edges(
+    limit: int = 100, before: str | None = None, after: str | None = None
+) -> list[dict[str, object]]:
+    sql, params = build_page_query(GRAPH_EDGES_SQL, limit, before, after)
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute(sql, params)
+        rows = await cur.fetchall()
+        await sectors.async_ensure_dictionary(conn, sectors.row_versions(rows))
+    if after:
+        rows.reverse()
+    return _graph_edges_from_rows(rows, paged=bool(before or after))
+
+
+async def latest_created_at() -> datetime | None:
+    async with async_connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        await cur.execute("SELECT created_at FROM scored_events ORDER BY created_at DESC LIMIT 1")
+        row = await cur.fetchone()
+    if not row:
+        return None
+    created_at = row["created_at"]
+    return created_at if isinstance(created_at, datetime) else datetime.fromisoformat(created_at)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Protocol
+
+from app.config import settings
+from app.ingest import async_raw_store, raw_store
+from app.models import EventBundle, NormalizedEvent, RawEvent, ScoredEvent
+from app.store import async_event_store, db, event_store, work_queue
+
+BACKENDS = ("postgres", "sqlite")
+
+
+class StorageBackend(Protocol):
+    name: str
+
+    def init(self) -> None: ...
+
+    def close(self) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+    def save_raw_events(self, events: Iterable[RawEvent]) -> int: ...
+
+    def fetch_unprocessed_raw_events(self, limit: int = 200, include_details: bool = True) -> list[RawEvent]: ...
+
+    def fetch_raw_event(self, raw_event_id: str, include_details: bool = True) -> RawEvent | None: ...
+
+    def fetch_raw_event_details(self, raw_event_id: str) -> dict[str, Any] | None: ...
+
+    def attach_details(self, events: list[RawEvent]) -> list[RawEvent]: ...
+
+    def recent_raw_event_ids(self, limit: int) -> list[str]: ...
+
+    def backlog_counts(self) -> dict[str, int]: ...
+
+    def save_normalized(self, event: NormalizedEvent) -> None: ...
+
+    def save_normalized_many(self, events: Iterable[NormalizedEvent]) -> int: ...
+
+    def fetch_unscored_events(self, limit: int = 200) -> list[NormalizedEvent]: ...
+
+    def fetch_normalized_event(self, raw_event_id: str) -> NormalizedEvent | None: ...
+
+    def save_scored(self, event: ScoredEvent) -> None: ...
+
+    def save_scored_many(self, events: Iterable[ScoredEvent]) -> int: ...
+
+    def fetch_scored_event(self, raw_event_id: str) -> ScoredEvent | None: ...
+
+    def fetch_event_bundle(self, raw_event_id: str) -> EventBundle | None: ...
+
+    def fetch_event_bundles(self, raw_event_ids: Iterable[str]) -> list[EventBundle]: ...
+
+    def latest_created_at(self) -> datetime | None: ...
+
+    def list_timeline(
+        self, limit: int = 50, before: str | None = None, after: str | None = None
+    ) -> list[dict[str, object]]: ...
+
+    def graph_edges(
+        self, limit: int = 100, before: str | None = None, after: str | None = None
+    ) -> list[dict[str, object]]: ...
+
+    def sector_heatmap(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        sector: str | None = None,
+        event_type: str | None = None,
+    ) -> dict[str, float]: ...
+
+    def iter_timeline(self, limit: int = 50, before: str | None = None) -> Iterator[dict[str, object]]: ...
+
+    def iter_graph_edges(self, limit: int = 100, before: str | None = None) -> Iterator[dict[str, object]]: ...
+
+    def iter_unprocessed_raw_events(self, limit: int = 200, include_details: bool = True) -> Iterator[RawEvent]: ...
+
+    def claim_raw_events(self, limit: int = 200, lease_sec: int | None = None) -> list[RawEvent]: ...
+
+    def claim_unscored_events(self, limit: int = 200, lease_sec: int | None = None) -> list[NormalizedEvent]: ...
+
+    def release_jobs(self, stage: str, raw_event_ids: Iterable[str], error: str = "") -> int: ...
+
+    async def afetch_raw_event(self, raw_event_id: str, include_details: bool = True) -> RawEvent | None: ...
+
+    async def afetch_event_bundle(self, raw_event_id: str) -> EventBundle | None: ...
+
+    async def afetch_event_bundles(self, raw_event_ids: Iterable[str]) -> list[EventBundle]: ...
+
+    async def afetch_normalized_event(self, raw_event_id: str) -> NormalizedEvent | None: ...
+
+    async def afetch_scored_event(self, raw_event_id: str) -> ScoredEvent | None: ...
+
+    async def alist_timeline(
+        self, limit: int = 50, before: str | None = None, after: str | None = None
+    ) -> list[dict[str, object]]: ...
+
+    async def agraph_edges(
+        self, limit: int = 100, before: str | None = None, after: str | None = None
+    ) -> list[dict[str, object]]: ...
+
+    async def asector_heatmap(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        sector: str | None = None,
+        event_type: str | None = None,
+    ) -> dict[str, float]: ...
+
+
+class PostgresBackend:
+    # Thin facade over the pooled Postgres store modules.
+    name = "postgres"
+
+    init = staticmethod(db.init_db)
+    save_raw_events = staticmethod(raw_store.save_raw_events)
+    fetch_unprocessed_raw_events = staticmethod(raw_store.fetch_unprocessed_raw_events)
+    fetch_raw_event = staticmethod(raw_store.fetch_raw_event)
+    fetch_raw_event_details = staticmethod(raw_store.fetch_raw_event_details)
+    attach_details = staticmethod(raw_store.attach_details)
+    recent_raw_event_ids = staticmethod(raw_store.recent_raw_event_ids)
+    backlog_counts = staticmethod(raw_store.backlog_counts)
+    save_normalized = staticmethod(event_store.save_normalized)
+    save_normalized_many = staticmethod(event_store.save_normalized_many)
+    fetch_unscored_events = staticmethod(event_store.fetch_unscored_events)
+    fetch_normalized_event = staticmethod(event_store.fetch_normalized_event)
+    save_scored = staticmethod(event_store.save_scored)
+    save_scored_many = staticmethod(event_store.save_scored_many)
+    fetch_scored_event = staticmethod(event_store.fetch_scored_event)
+    fetch_event_bundle = staticmethod(event_store.fetch_event_bundle)
+    fetch_event_bundles = staticmethod(event_store.fetch_event_bundles)
+    latest_created_at = staticmethod(event_store.latest_created_at)
+    list_timeline = staticmethod(event_store.list_timeline)
+    graph_edges = staticmethod(event_store.graph_edges)
+    sector_heatmap = staticmethod(event_store.sector_heatmap)
+    iter_timeline = staticmethod(event_store.iter_timeline)
+    iter_graph_edges = staticmethod(event_store.iter_graph_edges)
+    iter_unprocessed_raw_events = staticmethod(raw_store.iter_unprocessed_raw_events)
+    claim_raw_events = staticmethod(work_queue.claim_raw_events)
+    claim_unscored_events = staticmethod(work_queue.claim_unscored_events)
+    release_jobs = staticmethod(work_queue.release_jobs)
+    afetch_raw_event = staticmethod(async_raw_store.fetch_raw_event)
+    afetch_event_bundle = staticmethod(async_event_store.fetch_event_bundle)
+    afetch_event_bundles = staticmethod(async_event_store.fetch_event_bundles)
+    afetch_normalized_event = staticmethod(async_event_store.fetch_normalized_event)
+    afetch_scored_event = staticmethod(async_event_store.fetch_scored_event)
+    alist_timeline = staticmethod(async_event_store.list_timeline)
+    agraph_edges = staticmethod(async_event_store.graph_edges)
+    asector_heatmap = staticmethod(async_event_store.sector_heatmap)
+
+    @staticmethod
+    def close() -> None:
+        db.close_pool()
+
+    @staticmethod
+    async def aclose() -> None:
+        await db.close_async_pool()
+
+
+_backend: StorageBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def backend_name() -> str:
+    # An explicit FIM_DB_BACKEND wins; otherwise a configured DATABASE_URL
+    # selects Postgres and everything else falls back to SQLite at db_path.
+    name = (settings.db_backend or "").strip().lower()
+    if not name:
+        name = "postgres" if db._database_url() else "sqlite"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend {name!r}; expected one of {', '.join(BACKENDS)}.")
+    return name
+
+
+def get_backend() -> StorageBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if backend_name() == "sqlite":
+                    from app.store.sqlite_backend import SqliteBackend
+
+                    _backend = SqliteBackend(settings.db_path)
+                else:
+                    _backend = PostgresBackend()
+    return _backend
+
+
+def close_backend() -> None:
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+            _backend = None
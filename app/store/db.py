@@ -1,179 +1,126 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import threading
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
 
 import psycopg
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
 from app.config import settings
+from app.store.migrate import ensure_schema
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+_async_pool: AsyncConnectionPool | None = None
+_async_pool_lock = asyncio.Lock()
 
 
 def _database_url() -> str:
     return os.getenv("DATABASE_URL") or settings.database_url
 
 
-def get_db() -> psycopg.Connection:
+def _require_database_url() -> str:
     database_url = _database_url()
     if not database_url:
         raise ValueError("DATABASE_URL is missing. Set DATABASE_URL in .env.")
-    return psycopg.connect(database_url)
+    return database_url
+
+
+def get_db() -> psycopg.Connection:
+    # Standalone connection for one-off scripts; request paths use connection().
+    return psycopg.connect(_require_database_url())
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _require_database_url(),
+                    min_size=settings.db_pool_min_size,
+                    max_size=max(settings.db_pool_max_size, settings.db_pool_min_size),
+                    max_idle=settings.db_pool_max_idle_sec,
+                    timeout=settings.db_pool_timeout_sec,
+                    check=ConnectionPool.check_connection if settings.db_pool_check else None,
+                    name="fim-db",
+                    open=True,
+                )
+    return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def connection() -> Iterator[psycopg.Connection]:
+    # Commits when the block exits cleanly, rolls back on error.
+    with get_pool().connection() as conn:
+        yield conn
+
+
+def iter_batches(
+    query: str, params: Any = (), batch_rows: int | None = None, row_factory: Any = None
+) -> Iterator[list[Any]]:
+    # Runs `query` on a named (server-side) cursor and yields it batch_rows at
+    # a time, so result size never bounds memory. The pooled connection stays
+    # checked out, inside one transaction, until the generator is exhausted
+    # or closed.
+    with connection() as conn:
+        with conn.cursor(name=f"fim_{uuid.uuid4().hex}", row_factory=row_factory) as cur:
+            cur.itersize = batch_rows or settings.db_stream_batch_rows
+            cur.execute(query, params)
+            while True:
+                rows = cur.fetchmany(cur.itersize)
+                if not rows:
+                    break
+                yield rows
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    global _async_pool
+    if _async_pool is None:
+        async with _async_pool_lock:
+            if _async_pool is None:
+                pool = AsyncConnectionPool(
+                    _require_database_url(),
+                    min_size=settings.db_pool_min_size,
+                    max_size=max(settings.db_pool_max_size, settings.db_pool_min_size),
+                    max_idle=settings.db_pool_max_idle_sec,
+                    timeout=settings.db_pool_timeout_sec,
+                    check=AsyncConnectionPool.check_connection if settings.db_pool_check else None,
+                    name="fim-db-async",
+                    open=False,
+                )
+                await pool.open()
+                _async_pool = pool
+    return _async_pool
+
+
+async def close_async_pool() -> None:
+    global _async_pool
+    async with _async_pool_lock:
+        if _async_pool is not None:
+            await _async_pool.close()
+            _async_pool = None
+
+
+@asynccontextmanager
+async def async_connection() -> AsyncIterator[psycopg.AsyncConnection]:
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        yield conn
 
 
 def init_db() -> None:
-    conn = get_db()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS raw_events (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            url TEXT NOT NULL,
-            published_at TIMESTAMPTZ NOT NULL,
-            sector TEXT NOT NULL,
-            source TEXT NOT NULL,
-            payload JSONB NOT NULL
-        )
-        """
-    )
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS normalized_events (
-            raw_event_id TEXT PRIMARY KEY,
-            event_type TEXT NOT NULL,
-            policy_domain TEXT NOT NULL,
-            risk_signal TEXT NOT NULL,
-            rate_signal TEXT NOT NULL,
-            geo_signal TEXT NOT NULL,
-            sector_impacts JSONB NOT NULL,
-            sentiment TEXT NOT NULL,
-            rationale TEXT NOT NULL,
-            channels JSONB NOT NULL,
-            confidence DOUBLE PRECISION NOT NULL,
-            regime JSONB NOT NULL,
-            baseline JSONB NOT NULL
-        )
-        """
-    )
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS scored_events (
-            raw_event_id TEXT PRIMARY KEY,
-            event_type TEXT NOT NULL,
-            policy_domain TEXT NOT NULL,
-            risk_signal TEXT NOT NULL,
-            rate_signal TEXT NOT NULL,
-            geo_signal TEXT NOT NULL,
-            sector_impacts JSONB NOT NULL,
-            sentiment TEXT NOT NULL,
-            rationale TEXT NOT NULL,
-            fx_state TEXT NOT NULL,
-            sector_scores JSONB NOT NULL,
-            total_score DOUBLE PRECISION NOT NULL,
-            created_at TIMESTAMPTZ NOT NULL,
-            channels JSONB NOT NULL,
-            confidence DOUBLE PRECISION NOT NULL,
-            regime JSONB NOT NULL,
-            baseline JSONB NOT NULL
-        )
-        """
-    )
-
-    cur.execute("ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS policy_domain TEXT NOT NULL DEFAULT ''")
-    cur.execute("ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS risk_signal TEXT NOT NULL DEFAULT ''")
-    cur.execute("ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS rate_signal TEXT NOT NULL DEFAULT ''")
-    cur.execute("ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS geo_signal TEXT NOT NULL DEFAULT ''")
-    cur.execute("ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS channels JSONB NOT NULL DEFAULT '[]'")
-    cur.execute("ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS confidence DOUBLE PRECISION NOT NULL DEFAULT 0.6")
-    cur.execute(
-        "ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS regime JSONB NOT NULL DEFAULT '{\"risk_sentiment\":\"neutral\",\"volatility\":\"elevated\",\"liquidity\":\"neutral\"}'"
-    )
-    cur.execute("ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS baseline JSONB NOT NULL DEFAULT '{}'")
-
-    cur.execute("ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS policy_domain TEXT NOT NULL DEFAULT ''")
-    cur.execute("ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS risk_signal TEXT NOT NULL DEFAULT ''")
-    cur.execute("ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS rate_signal TEXT NOT NULL DEFAULT ''")
-    cur.execute("ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS geo_signal TEXT NOT NULL DEFAULT ''")
-    cur.execute("ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS channels JSONB NOT NULL DEFAULT '[]'")
-    cur.execute("ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS confidence DOUBLE PRECISION NOT NULL DEFAULT 0.6")
-    cur.execute(
-        "ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS regime JSONB NOT NULL DEFAULT '{\"risk_sentiment\":\"neutral\",\"volatility\":\"elevated\",\"liquidity\":\"neutral\"}'"
-    )
-    cur.execute("ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS baseline JSONB NOT NULL DEFAULT '{}'")
-    cur.execute(
-        """
-        DO $$
-        BEGIN
-            ALTER TABLE scored_events ALTER COLUMN total_score TYPE DOUBLE PRECISION USING total_score::double precision;
-        EXCEPTION
-            WHEN undefined_column THEN NULL;
-            WHEN datatype_mismatch THEN NULL;
-        END $$;
-        """
-    )
-
-    # Backward compatibility for older schema columns.
-    cur.execute(
-        """
-        DO $$
-        BEGIN
-            ALTER TABLE normalized_events ALTER COLUMN region DROP NOT NULL;
-        EXCEPTION
-            WHEN undefined_column THEN NULL;
-        END $$;
-        """
-    )
-    cur.execute(
-        """
-        DO $$
-        BEGIN
-            ALTER TABLE normalized_events ALTER COLUMN country DROP NOT NULL;
-        EXCEPTION
-            WHEN undefined_column THEN NULL;
-        END $$;
-        """
-    )
-    cur.execute(
-        """
-        DO $$
-        BEGIN
-            ALTER TABLE normalized_events ALTER COLUMN fx_theme DROP NOT NULL;
-        EXCEPTION
-            WHEN undefined_column THEN NULL;
-        END $$;
-        """
-    )
-    cur.execute(
-        """
-        DO $$
-        BEGIN
-            ALTER TABLE scored_events ALTER COLUMN region DROP NOT NULL;
-        EXCEPTION
-            WHEN undefined_column THEN NULL;
-        END $$;
-        """
-    )
-    cur.execute(
-        """
-        DO $$
-        BEGIN
-            ALTER TABLE scored_events ALTER COLUMN country DROP NOT NULL;
-        EXCEPTION
-            WHEN undefined_column THEN NULL;
-        END $$;
-        """
-    )
-    cur.execute(
-        """
-        DO $$
-        BEGIN
-            ALTER TABLE scored_events ALTER COLUMN fx_theme DROP NOT NULL;
-        EXCEPTION
-            WHEN undefined_column THEN NULL;
-        END $$;
-        """
-    )
-
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        ensure_schema(conn, auto_migrate=settings.db_auto_migrate)
@@ -1,112 +1,118 @@
 from __future__ import annotations
 
+import base64
 import json
 from datetime import datetime
+from typing import Any, Iterable, Iterator
 
 from psycopg.rows import dict_row
 
-from app.models import NormalizedEvent, ScoredEvent
+from app.ingest.raw_store import _raw_from_row
+from app.models import EventBundle, NormalizedEvent, ScoredEvent
 from app.rules.weights import ALL_SECTORS
-from app.store.db import get_db
+from app.store import sectors
+from app.store.db import connection, iter_batches
 
 
-def reset_scored_data() -> None:
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute("TRUNCATE scored_events")
-    cur.execute("TRUNCATE normalized_events")
-    conn.commit()
-    conn.close()
+# Derived rows live in the partition of their raw event's published_at, read
+# from the parent row. An event whose raw row is missing selects nothing, so
+# it is skipped instead of failing the whole batch; the save functions return
+# how many rows were written.
+_FROM_RAW_EVENT = "FROM raw_events r WHERE r.id = %s"
 
+_NORMALIZED_UPSERT = """
+INSERT INTO normalized_events
+(raw_event_id, event_type, policy_domain, risk_signal, rate_signal, geo_signal, sector_impacts, sentiment, rationale, channels, confidence, regime, baseline,
+ published_at)
+SELECT %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, r.published_at
+{from_raw}
+ON CONFLICT (raw_event_id, published_at) DO UPDATE SET
+    event_type = EXCLUDED.event_type,
+    policy_domain = EXCLUDED.policy_domain,
+    risk_signal = EXCLUDED.risk_signal,
+    rate_signal = EXCLUDED.rate_signal,
+    geo_signal = EXCLUDED.geo_signal,
+    sector_impacts = EXCLUDED.sector_impacts,
+    sentiment = EXCLUDED.sentiment,
+    rationale = EXCLUDED.rationale,
+    channels = EXCLUDED.channels,
+    confidence = EXCLUDED.confidence,
+    regime = EXCLUDED.regime,
+    baseline = EXCLUDED.baseline,
+    normalized_at = EXCLUDED.normalized_at
+""".format(from_raw=_FROM_RAW_EVENT)
 
-def save_normalized(event: NormalizedEvent) -> None:
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO normalized_events
-        (raw_event_id, event_type, policy_domain, risk_signal, rate_signal, geo_signal, sector_impacts, sentiment, rationale, channels, confidence, regime, baseline)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (raw_event_id) DO UPDATE SET
-            event_type = EXCLUDED.event_type,
-            policy_domain = EXCLUDED.policy_domain,
-            risk_signal = EXCLUDED.risk_signal,
-            rate_signal = EXCLUDED.rate_signal,
-            geo_signal = EXCLUDED.geo_signal,
-            sector_impacts = EXCLUDED.sector_impacts,
-            sentiment = EXCLUDED.sentiment,
-            rationale = EXCLUDED.rationale,
-            channels = EXCLUDED.channels,
-            confidence = EXCLUDED.confidence,
-            regime = EXCLUDED.regime,
-            baseline = EXCLUDED.baseline
-        """,
-        (
-            event.raw_event_id,
-            event.event_type,
-            event.policy_domain,
-            event.risk_signal,
-            event.rate_signal,
-            event.geo_signal,
-            json.dumps(event.sector_impacts, ensure_ascii=True),
-            event.sentiment,
-            event.rationale,
-            json.dumps(event.channels, ensure_ascii=True),
-            event.confidence,
-            json.dumps(event.regime, ensure_ascii=True),
-            json.dumps(event.baseline, ensure_ascii=True),
-        ),
+
+def _normalized_params(event: NormalizedEvent) -> tuple[object, ...]:
+    return (
+        event.raw_event_id,
+        event.event_type,
+        event.policy_domain,
+        event.risk_signal,
+        event.rate_signal,
+        event.geo_signal,
+        json.dumps(event.sector_impacts, ensure_ascii=True),
+        event.sentiment,
+        event.rationale,
+        json.dumps(event.channels, ensure_ascii=True),
+        event.confidence,
+        json.dumps(event.regime, ensure_ascii=True),
+        json.dumps(event.baseline, ensure_ascii=True),
+        event.raw_event_id,
     )
-    conn.commit()
-    conn.close()
+
+
+def save_normalized(event: NormalizedEvent) -> None:
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(_NORMALIZED_UPSERT, _normalized_params(event))
+
+
+def save_normalized_many(events: Iterable[NormalizedEvent]) -> int:
+    batch = [_normalized_params(event) for event in events]
+    if not batch:
+        return 0
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.executemany(_NORMALIZED_UPSERT, batch)
+    return cur.rowcount
+
+
+# Joins between event tables probe the other side per row on its full
+# (id, published_at) key. The lateral form keeps the planner from treating
+# the two correlated columns as independent, which would estimate one match
+# and hash-join every partition; each probe is pruned to one partition.
+UNSCORED_EVENTS_SQL = """
+SELECT n.* FROM raw_events r
+JOIN LATERAL (
+    SELECT * FROM normalized_events n
+    WHERE n.raw_event_id = r.id AND n.published_at = r.published_at
+    LIMIT 1
+) n ON true
+WHERE r.state = 'normalized'
+ORDER BY r.published_at DESC, r.id DESC
+LIMIT %s
+"""
 
 
 def fetch_unscored_events(limit: int = 200) -> list[NormalizedEvent]:
-    conn = get_db()
-    cur = conn.cursor(row_factory=dict_row)
-    cur.execute(
-        """
-        SELECT n.* FROM normalized_events n
-        LEFT JOIN scored_events s ON s.raw_event_id::text = n.raw_event_id::text
-        WHERE s.raw_event_id IS NULL
-        ORDER BY n.raw_event_id DESC
-        LIMIT %s
-        """,
-        (limit,),
-    )
-    rows = cur.fetchall()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(UNSCORED_EVENTS_SQL, (limit,))
+        rows = cur.fetchall()
 
-    events: list[NormalizedEvent] = []
-    for row in rows:
-        events.append(
-            NormalizedEvent(
-                raw_event_id=row["raw_event_id"],
-                event_type=row["event_type"],
-                policy_domain=row["policy_domain"],
-                risk_signal=row["risk_signal"],
-                rate_signal=row["rate_signal"],
-                geo_signal=row["geo_signal"],
-                sector_impacts=row["sector_impacts"],
-                sentiment=row["sentiment"],
-                rationale=row["rationale"],
-                channels=row.get("channels") or [],
-                confidence=row.get("confidence", 0.6),
-                regime=row.get("regime") or {},
-                baseline=row.get("baseline") or {},
-            )
-        )
-    return events
+    return [_normalized_from_row(row) for row in rows]
 
 
 def fetch_normalized_event(raw_event_id: str) -> NormalizedEvent | None:
-    conn = get_db()
-    cur = conn.cursor(row_factory=dict_row)
-    cur.execute("SELECT * FROM normalized_events WHERE raw_event_id = %s", (raw_event_id,))
-    row = cur.fetchone()
-    conn.close()
-    if not row:
-        return None
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute("SELECT * FROM normalized_events WHERE raw_event_id = %s", (raw_event_id,))
+        row = cur.fetchone()
+    return _normalized_from_row(row) if row else None
+
+
+def _normalized_from_row(row: dict[str, Any]) -> NormalizedEvent:
     return NormalizedEvent(
         raw_event_id=row["raw_event_id"],
         event_type=row["event_type"],
@@ -124,65 +130,99 @@ def fetch_normalized_event(raw_event_id: str) -> NormalizedEvent | None:
     )
 
 
-def save_scored(event: ScoredEvent) -> None:
-    conn = get_db()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO scored_events
-        (raw_event_id, event_type, policy_domain, risk_signal, rate_signal, geo_signal, sector_impacts, sentiment, rationale,
-         fx_state, sector_scores, total_score, created_at, channels, confidence, regime, baseline)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (raw_event_id) DO UPDATE SET
-            event_type = EXCLUDED.event_type,
-            policy_domain = EXCLUDED.policy_domain,
-            risk_signal = EXCLUDED.risk_signal,
-            rate_signal = EXCLUDED.rate_signal,
-            geo_signal = EXCLUDED.geo_signal,
-            sector_impacts = EXCLUDED.sector_impacts,
-            sentiment = EXCLUDED.sentiment,
-            rationale = EXCLUDED.rationale,
-            fx_state = EXCLUDED.fx_state,
-            sector_scores = EXCLUDED.sector_scores,
-            total_score = EXCLUDED.total_score,
-            created_at = EXCLUDED.created_at,
-            channels = EXCLUDED.channels,
-            confidence = EXCLUDED.confidence,
-            regime = EXCLUDED.regime,
-            baseline = EXCLUDED.baseline
-        """,
-        (
-            event.raw_event_id,
-            event.event_type,
-            event.policy_domain,
-            event.risk_signal,
-            event.rate_signal,
-            event.geo_signal,
-            json.dumps(event.sector_impacts, ensure_ascii=True),
-            event.sentiment,
-            event.rationale,
-            event.fx_state,
-            json.dumps(event.sector_scores, ensure_ascii=True),
-            event.total_score,
-            event.created_at,
-            json.dumps(event.channels, ensure_ascii=True),
-            event.confidence,
-            json.dumps(event.regime, ensure_ascii=True),
-            json.dumps(event.baseline, ensure_ascii=True),
-        ),
+_SCORED_UPSERT = """
+INSERT INTO scored_events
+(raw_event_id, event_type, policy_domain, risk_signal, rate_signal, geo_signal, sector_impacts, sentiment, rationale,
+ fx_state, sector_scores, total_score, created_at, channels, confidence, regime, baseline, sector_dict_version,
+ sector_scores_vec, sector_impacts_vec, published_at)
+SELECT %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, r.published_at
+{from_raw}
+ON CONFLICT (raw_event_id, published_at) DO UPDATE SET
+    event_type = EXCLUDED.event_type,
+    policy_domain = EXCLUDED.policy_domain,
+    risk_signal = EXCLUDED.risk_signal,
+    rate_signal = EXCLUDED.rate_signal,
+    geo_signal = EXCLUDED.geo_signal,
+    sector_impacts = EXCLUDED.sector_impacts,
+    sentiment = EXCLUDED.sentiment,
+    rationale = EXCLUDED.rationale,
+    fx_state = EXCLUDED.fx_state,
+    sector_scores = EXCLUDED.sector_scores,
+    total_score = EXCLUDED.total_score,
+    created_at = EXCLUDED.created_at,
+    channels = EXCLUDED.channels,
+    confidence = EXCLUDED.confidence,
+    regime = EXCLUDED.regime,
+    baseline = EXCLUDED.baseline,
+    sector_dict_version = EXCLUDED.sector_dict_version,
+    sector_scores_vec = EXCLUDED.sector_scores_vec,
+    sector_impacts_vec = EXCLUDED.sector_impacts_vec
+""".format(from_raw=_FROM_RAW_EVENT)
+
+
+def _scored_params(event: ScoredEvent, sector_version: int) -> tuple[object, ...]:
+    # Dictionary sectors go into the float4[] columns; the JSONB columns only
+    # keep names the dictionary does not know.
+    impacts_vec, impacts_extra = sectors.encode(event.sector_impacts, sector_version)
+    scores_vec, scores_extra = sectors.encode(event.sector_scores, sector_version)
+    return (
+        event.raw_event_id,
+        event.event_type,
+        event.policy_domain,
+        event.risk_signal,
+        event.rate_signal,
+        event.geo_signal,
+        json.dumps(impacts_extra, ensure_ascii=True),
+        event.sentiment,
+        event.rationale,
+        event.fx_state,
+        json.dumps(scores_extra, ensure_ascii=True),
+        event.total_score,
+        event.created_at,
+        json.dumps(event.channels, ensure_ascii=True),
+        event.confidence,
+        json.dumps(event.regime, ensure_ascii=True),
+        json.dumps(event.baseline, ensure_ascii=True),
+        sector_version,
+        scores_vec,
+        impacts_vec,
+        event.raw_event_id,
     )
-    conn.commit()
-    conn.close()
+
+
+def save_scored(event: ScoredEvent) -> None:
+    with connection() as conn:
+        version = sectors.ensure_dictionary(conn)
+        cur = conn.cursor()
+        cur.execute(_SCORED_UPSERT, _scored_params(event, version))
+
+
+def save_scored_many(events: Iterable[ScoredEvent]) -> int:
+    events = list(events)
+    if not events:
+        return 0
+    with connection() as conn:
+        version = sectors.ensure_dictionary(conn)
+        cur = conn.cursor()
+        cur.executemany(_SCORED_UPSERT, [_scored_params(event, version) for event in events])
+    return cur.rowcount
 
 
 def fetch_scored_event(raw_event_id: str) -> ScoredEvent | None:
-    conn = get_db()
-    cur = conn.cursor(row_factory=dict_row)
-    cur.execute("SELECT * FROM scored_events WHERE raw_event_id = %s", (raw_event_id,))
-    row = cur.fetchone()
-    conn.close()
-    if not row:
-        return None
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute("SELECT * FROM scored_events WHERE raw_event_id = %s", (raw_event_id,))
+        row = cur.fetchone()
+        if row:
+            sectors.ensure_dictionary(conn, [row["sector_dict_version"]])
+    return _scored_from_row(row) if row else None
+
+
+def _sector_scores(row: dict[str, Any]) -> dict[str, float]:
+    return sectors.decode(row.get("sector_dict_version"), row.get("sector_scores_vec"), row["sector_scores"])
+
+
+def _scored_from_row(row: dict[str, Any]) -> ScoredEvent:
     return ScoredEvent(
         raw_event_id=row["raw_event_id"],
         event_type=row["event_type"],
@@ -190,11 +230,13 @@ def fetch_scored_event(raw_event_id: str) -> ScoredEvent | None:
         risk_signal=row["risk_signal"],
         rate_signal=row["rate_signal"],
         geo_signal=row["geo_signal"],
-        sector_impacts=row["sector_impacts"],
+        sector_impacts=sectors.decode(
+            row.get("sector_dict_version"), row.get("sector_impacts_vec"), row["sector_impacts"]
+        ),
         sentiment=row["sentiment"],
         rationale=row["rationale"],
         fx_state=row["fx_state"],
-        sector_scores=row["sector_scores"],
+        sector_scores=_sector_scores(row),
         total_score=row["total_score"],
         created_at=row["created_at"],
         channels=row.get("channels") or [],
@@ -204,80 +246,288 @@ def fetch_scored_event(raw_event_id: str) -> ScoredEvent | None:
     )
 
 
-def list_timeline(limit: int = 50) -> list[dict[str, object]]:
-    conn = get_db()
-    cur = conn.cursor(row_factory=dict_row)
-    cur.execute(
-        """
-        SELECT r.title, r.url, r.published_at, r.sector, s.risk_signal, s.rate_signal, s.geo_signal, s.fx_state, s.sentiment, s.total_score
-        FROM raw_events r
-        JOIN scored_events s ON s.raw_event_id::text = r.id
-        ORDER BY r.published_at DESC
-        LIMIT %s
-        """,
-        (limit,),
+# Raw, normalized and scored rows for one or more events in a single round
+# trip. Each side is folded to JSON so same-named columns cannot collide, and
+# is probed laterally like the other event joins.
+_EVENT_BUNDLE_SQL = """
+SELECT to_jsonb(r) AS raw, c.details, to_jsonb(n) AS normalized, to_jsonb(s) AS scored
+FROM raw_events r
+LEFT JOIN LATERAL (
+    SELECT c.details FROM raw_event_content c
+    WHERE c.raw_event_id = r.id AND c.published_at = r.published_at
+    LIMIT 1
+) c ON true
+LEFT JOIN LATERAL (
+    SELECT * FROM normalized_events n
+    WHERE n.raw_event_id = r.id AND n.published_at = r.published_at
+    LIMIT 1
+) n ON true
+LEFT JOIN LATERAL (
+    SELECT * FROM scored_events s
+    WHERE s.raw_event_id = r.id AND s.published_at = r.published_at
+    LIMIT 1
+) s ON true
+WHERE {where}
+"""
+
+EVENT_BUNDLE_SQL = _EVENT_BUNDLE_SQL.format(where="r.id = %s")
+EVENT_BUNDLES_SQL = _EVENT_BUNDLE_SQL.format(where="r.id = ANY(%s)")
+
+
+def fetch_event_bundle(raw_event_id: str) -> EventBundle | None:
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(EVENT_BUNDLE_SQL, (raw_event_id,))
+        row = cur.fetchone()
+        if row:
+            sectors.ensure_dictionary(conn, _bundle_sector_versions([row]))
+    return _bundle_from_row(row) if row else None
+
+
+def fetch_event_bundles(raw_event_ids: Iterable[str]) -> list[EventBundle]:
+    ids = list(dict.fromkeys(raw_event_ids))
+    if not ids:
+        return []
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(EVENT_BUNDLES_SQL, (ids,))
+        rows = cur.fetchall()
+        sectors.ensure_dictionary(conn, _bundle_sector_versions(rows))
+    return _bundles_in_order(ids, [_bundle_from_row(row) for row in rows])
+
+
+def _bundle_sector_versions(rows: list[dict[str, Any]]) -> set[int | None]:
+    return sectors.row_versions(row["scored"] for row in rows)
+
+
+def _bundle_from_row(row: dict[str, Any]) -> EventBundle:
+    return EventBundle(
+        raw=_raw_from_row({**row["raw"], "details": row["details"]}),
+        normalized=_normalized_from_row(row["normalized"]) if row["normalized"] else None,
+        scored=_scored_from_row(row["scored"]) if row["scored"] else None,
     )
-    rows = cur.fetchall()
-    conn.close()
-
-    return [
-        {
-            "title": row["title"],
-            "url": row["url"],
-            "published_at": row["published_at"].isoformat()
-            if hasattr(row["published_at"], "isoformat")
-            else row["published_at"],
-            "sector": row["sector"],
-            "risk_signal": row["risk_signal"],
-            "rate_signal": row["rate_signal"],
-            "geo_signal": row["geo_signal"],
-            "fx_state": row["fx_state"],
-            "sentiment": row["sentiment"],
-            "total_score": row["total_score"],
-        }
-        for row in rows
-    ]
-
-
-def sector_heatmap() -> dict[str, float]:
-    conn = get_db()
-    cur = conn.cursor(row_factory=dict_row)
-    cur.execute("SELECT sector_scores FROM scored_events")
-    rows = cur.fetchall()
-    conn.close()
-
-    totals: dict[str, float] = {}
-    for row in rows:
-        scores = row["sector_scores"]
-        for sector, score in scores.items():
-            totals[sector] = totals.get(sector, 0.0) + float(score)
-    for sector in ALL_SECTORS:
-        totals.setdefault(sector, 0.0)
-    return {sector: round(value, 3) for sector, value in totals.items()}
 
 
-def graph_edges(limit: int = 100) -> list[dict[str, object]]:
-    conn = get_db()
-    cur = conn.cursor(row_factory=dict_row)
-    cur.execute(
+def _bundles_in_order(ids: list[str], bundles: list[EventBundle]) -> list[EventBundle]:
+    by_id = {bundle.raw.id: bundle for bundle in bundles}
+    return [by_id[raw_event_id] for raw_event_id in ids if raw_event_id in by_id]
+
+
+def encode_cursor(published_at: datetime, raw_event_id: str) -> str:
+    raw = f"{published_at.isoformat()}|{raw_event_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, raw_event_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(published_at), raw_event_id
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def build_page_query(
+    template: str, limit: int, before: str | None = None, after: str | None = None
+) -> tuple[str, tuple[object, ...]]:
+    # Keyset pagination on (published_at, id), newest first. `after` pages
+    # toward newer rows, so it scans ascending and the caller reverses.
+    if before and after:
+        raise ValueError("Use either before or after, not both.")
+    if before:
+        published_at, raw_event_id = decode_cursor(before)
+        where, direction, params = "WHERE (r.published_at, r.id) < (%s, %s)", "DESC", (published_at, raw_event_id)
+    elif after:
+        published_at, raw_event_id = decode_cursor(after)
+        where, direction, params = "WHERE (r.published_at, r.id) > (%s, %s)", "ASC", (published_at, raw_event_id)
+    else:
+        where, direction, params = "", "DESC", ()
+    return template.format(where=where, direction=direction), params + (limit,)
+
+
+TIMELINE_SQL = """
+SELECT r.id, r.title, r.url, r.published_at, r.sector, s.risk_signal, s.rate_signal, s.geo_signal, s.fx_state, s.sentiment, s.total_score
+FROM raw_events r
+JOIN LATERAL (
+    SELECT * FROM scored_events s
+    WHERE s.raw_event_id = r.id AND s.published_at = r.published_at
+    LIMIT 1
+) s ON true
+{where}
+ORDER BY r.published_at {direction}, r.id {direction}
+LIMIT %s
+"""
+
+
+def list_timeline(limit: int = 50, before: str | None = None, after: str | None = None) -> list[dict[str, object]]:
+    sql, params = build_page_query(TIMELINE_SQL, limit, before, after)
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+    if after:
+        rows.reverse()
+
+    return [_timeline_item(row) for row in rows]
+
+
+def iter_timeline(limit: int = 50, before: str | None = None) -> Iterator[dict[str, object]]:
+    # Streaming form of list_timeline over a server-side cursor. Only pages
+    # toward older rows: an `after` page is read ascending and would have to
+    # be buffered to come out newest first.
+    sql, params = build_page_query(TIMELINE_SQL, limit, before)
+    for rows in iter_batches(sql, params, row_factory=dict_row):
+        for row in rows:
+            yield _timeline_item(row)
+
+
+def _timeline_item(row: dict[str, Any]) -> dict[str, object]:
+    return {
+        "cursor": encode_cursor(row["published_at"], row["id"]),
+        "title": row["title"],
+        "url": row["url"],
+        "published_at": row["published_at"].isoformat()
+        if hasattr(row["published_at"], "isoformat")
+        else row["published_at"],
+        "sector": row["sector"],
+        "risk_signal": row["risk_signal"],
+        "rate_signal": row["rate_signal"],
+        "geo_signal": row["geo_signal"],
+        "fx_state": row["fx_state"],
+        "sentiment": row["sentiment"],
+        "total_score": row["total_score"],
+    }
+
+
+def sector_heatmap(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    sector: str | None = None,
+    event_type: str | None = None,
+) -> dict[str, float]:
+    sql, params = build_heatmap_query(since, until, sector, event_type)
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+    return _heatmap_from_rows(rows, sector)
+
+
+def build_heatmap_query(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    sector: str | None = None,
+    event_type: str | None = None,
+) -> tuple[str, list[object]]:
+    # Unfiltered requests read the trigger-maintained aggregate; filtered ones
+    # are summed inside Postgres so only one row per sector comes back.
+    if since is None and until is None and event_type is None:
+        if sector is None:
+            return "SELECT sector, total FROM sector_totals", []
+        return "SELECT sector, total FROM sector_totals WHERE sector = %s", [sector]
+
+    # scored_events carries its raw event's published_at, so time windows
+    # prune partitions without a join.
+    conditions = []
+    params: list[object] = []
+    if since is not None:
+        conditions.append("s.published_at >= %s")
+        params.append(since)
+    if until is not None:
+        conditions.append("s.published_at < %s")
+        params.append(until)
+    if event_type is not None:
+        conditions.append("s.event_type = %s")
+        params.append(event_type)
+    where = " AND ".join(conditions) or "true"
+    # Vector elements are mapped to names through the row's dictionary
+    # version; off-dictionary extras still come from the JSONB column, which
+    # is normally empty.
+    vector_where, extra_where = where, where
+    vector_params, extra_params = list(params), list(params)
+    if sector is not None:
+        vector_where += " AND d.sectors[e.ord] = %s"
+        extra_where += " AND e.key = %s"
+        vector_params.append(sector)
+        extra_params.append(sector)
+    sql = f"""
+        SELECT sector, SUM(score) AS total
+        FROM (
+            SELECT d.sectors[e.ord] AS sector, e.score::double precision AS score
+            FROM scored_events s
+            JOIN sector_dictionary d ON d.version = s.sector_dict_version
+            CROSS JOIN LATERAL unnest(s.sector_scores_vec) WITH ORDINALITY e(score, ord)
+            WHERE {vector_where} AND e.score IS NOT NULL
+            UNION ALL
+            SELECT e.key AS sector, e.value::double precision AS score
+            FROM scored_events s
+            CROSS JOIN LATERAL jsonb_each_text(s.sector_scores) e
+            WHERE {extra_where}
+        ) scores
+        GROUP BY sector
         """
-        SELECT r.title, s.fx_state, s.risk_signal, s.rate_signal, s.geo_signal, s.sector_scores
-        FROM raw_events r
-        JOIN scored_events s ON s.raw_event_id::text = r.id
-        ORDER BY r.published_at DESC
-        LIMIT %s
-        """,
-        (limit,),
-    )
-    rows = cur.fetchall()
-    conn.close()
+    return sql, vector_params + extra_params
+
+
+def _heatmap_from_rows(rows: list[dict[str, Any]], sector: str | None) -> dict[str, float]:
+    totals: dict[str, float] = {row["sector"]: float(row["total"]) for row in rows}
+    if sector is None:
+        for name in ALL_SECTORS:
+            totals.setdefault(name, 0.0)
+    elif not totals:
+        totals[sector] = 0.0
+    return {name: round(value, 3) for name, value in totals.items()}
+
+
+GRAPH_EDGES_SQL = """
+SELECT r.id, r.published_at, r.title, s.fx_state, s.risk_signal, s.rate_signal, s.geo_signal, s.sector_dict_version,
+       s.sector_scores_vec, s.sector_scores
+FROM raw_events r
+JOIN LATERAL (
+    SELECT * FROM scored_events s
+    WHERE s.raw_event_id = r.id AND s.published_at = r.published_at
+    LIMIT 1
+) s ON true
+{where}
+ORDER BY r.published_at {direction}, r.id {direction}
+LIMIT %s
+"""
+
+
+def graph_edges(limit: int = 100, before: str | None = None, after: str | None = None) -> list[dict[str, object]]:
+    sql, params = build_page_query(GRAPH_EDGES_SQL, limit, before, after)
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+        sectors.ensure_dictionary(conn, sectors.row_versions(rows))
+    if after:
+        rows.reverse()
+
+    return _graph_edges_from_rows(rows, paged=bool(before or after))
+
+
+def iter_graph_edges(limit: int = 100, before: str | None = None) -> Iterator[dict[str, object]]:
+    # Streaming form of graph_edges; see iter_timeline. No sample edge is
+    # emitted for an empty result.
+    sql, params = build_page_query(GRAPH_EDGES_SQL, limit, before)
+    for rows in iter_batches(sql, params, row_factory=dict_row):
+        versions = sectors.row_versions(rows)
+        if sectors.needs_load(versions):
+            with connection() as conn:
+                sectors.ensure_dictionary(conn, versions)
+        yield from _graph_edges_from_rows(rows, paged=True)
+
 
+def _graph_edges_from_rows(rows: list[dict[str, Any]], paged: bool) -> list[dict[str, object]]:
     edges = []
     for row in rows:
-        scores = row["sector_scores"]
+        scores = _sector_scores(row)
+        cursor = encode_cursor(row["published_at"], row["id"])
         for sector, score in scores.items():
             edges.append(
                 {
+                    "cursor": cursor,
                     "event": row["title"],
                     "fx": row["fx_state"],
                     "risk_signal": row["risk_signal"],
@@ -288,7 +538,7 @@ def graph_edges(limit: int = 100) -> list[dict[str, object]]:
                     "fx_theme": row["fx_state"],
                 }
             )
-    if not edges:
+    if not edges and not paged:
         return [
             {
                 "event": "Sample event (default)",
@@ -305,11 +555,10 @@ def graph_edges(limit: int = 100) -> list[dict[str, object]]:
 
 
 def latest_created_at() -> datetime | None:
-    conn = get_db()
-    cur = conn.cursor(row_factory=dict_row)
-    cur.execute("SELECT created_at FROM scored_events ORDER BY created_at DESC LIMIT 1")
-    row = cur.fetchone()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute("SELECT created_at FROM scored_events ORDER BY created_at DESC LIMIT 1")
+        row = cur.fetchone()
     if not row:
         return None
     created_at = row["created_at"]
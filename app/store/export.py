@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.store.db import connection, iter_batches
+from app.store.partitions import add_months, month_start, partition_months
+from app.store.sectors import LOAD_DICTIONARIES_SQL
+
+logger = logging.getLogger("app.store.export")
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+_TIMESTAMP = pa.timestamp("us", tz="UTC")
+_VECTOR = pa.list_(pa.float32())
+
+# (column, select expression, Arrow type) per exported table. JSONB columns
+# are shipped as JSON text so Postgres does the serialization and Python
+# never builds dicts; sector vectors keep their float4[] form, with the
+# sector dictionary stored in the schema metadata.
+_COLUMNS: dict[str, list[tuple[str, str, pa.DataType]]] = {
+    "raw_events": [
+        ("id", "r.id", pa.string()),
+        ("source", "r.source", pa.string()),
+        ("title", "r.title", pa.string()),
+        ("url", "r.url", pa.string()),
+        ("sector", "r.sector", pa.string()),
+        ("state", "r.state", pa.string()),
+        ("published_at", "r.published_at", _TIMESTAMP),
+        ("payload", "r.payload::text", pa.string()),
+        ("details", "c.details::text", pa.string()),
+    ],
+    "normalized_events": [
+        ("raw_event_id", "n.raw_event_id", pa.string()),
+        ("event_type", "n.event_type", pa.string()),
+        ("policy_domain", "n.policy_domain", pa.string()),
+        ("risk_signal", "n.risk_signal", pa.string()),
+        ("rate_signal", "n.rate_signal", pa.string()),
+        ("geo_signal", "n.geo_signal", pa.string()),
+        ("sector_impacts", "n.sector_impacts::text", pa.string()),
+        ("sentiment", "n.sentiment", pa.string()),
+        ("rationale", "n.rationale", pa.string()),
+        ("channels", "n.channels::text", pa.string()),
+        ("confidence", "n.confidence", pa.float64()),
+        ("regime", "n.regime::text", pa.string()),
+        ("baseline", "n.baseline::text", pa.string()),
+        ("normalized_at", "n.normalized_at", _TIMESTAMP),
+        ("published_at", "n.published_at", _TIMESTAMP),
+    ],
+    "scored_events": [
+        ("raw_event_id", "s.raw_event_id", pa.string()),
+        ("event_type", "s.event_type", pa.string()),
+        ("policy_domain", "s.policy_domain", pa.string()),
+        ("risk_signal", "s.risk_signal", pa.string()),
+        ("rate_signal", "s.rate_signal", pa.string()),
+        ("geo_signal", "s.geo_signal", pa.string()),
+        ("sentiment", "s.sentiment", pa.string()),
+        ("rationale", "s.rationale", pa.string()),
+        ("fx_state", "s.fx_state", pa.string()),
+        ("total_score", "s.total_score", pa.float64()),
+        ("sector_dict_version", "s.sector_dict_version", pa.int16()),
+        ("sector_scores_vec", "s.sector_scores_vec", _VECTOR),
+        ("sector_impacts_vec", "s.sector_impacts_vec", _VECTOR),
+        ("sector_scores", "s.sector_scores::text", pa.string()),
+        ("sector_impacts", "s.sector_impacts::text", pa.string()),
+        ("channels", "s.channels::text", pa.string()),
+        ("confidence", "s.confidence", pa.float64()),
+        ("regime", "s.regime::text", pa.string()),
+        ("baseline", "s.baseline::text", pa.string()),
+        ("created_at", "s.created_at", _TIMESTAMP),
+        ("published_at", "s.published_at", _TIMESTAMP),
+    ],
+}
+
+EXPORT_TABLES = tuple(_COLUMNS)
+
+# Bulk reads of a time range, so content is hash-joined rather than probed
+# per row; the range is repeated on both sides to prune both to the same
+# partitions.
+_FROM = {
+    "raw_events": (
+        "raw_events r LEFT JOIN raw_event_content c ON c.raw_event_id = r.id AND c.published_at = r.published_at"
+        "{content_range}",
+        "r",
+    ),
+    "normalized_events": ("normalized_events n", "n"),
+    "scored_events": ("scored_events s", "s"),
+}
+
+
+def build_export_query(
+    table: str, since: datetime | None = None, until: datetime | None = None
+) -> tuple[str, list[object]]:
+    if table not in _COLUMNS:
+        raise ValueError(f"Unknown export table {table!r}; expected one of {', '.join(EXPORT_TABLES)}.")
+    source, alias = _FROM[table]
+    conditions, content_range = [], []
+    params: list[object] = []
+    if since is not None:
+        conditions.append(f"{alias}.published_at >= %s")
+        content_range.append("c.published_at >= %s")
+        params.append(since)
+    if until is not None:
+        conditions.append(f"{alias}.published_at < %s")
+        content_range.append("c.published_at < %s")
+        params.append(until)
+    columns = ", ".join(f"{expr} AS {name}" for name, expr, _ in _COLUMNS[table])
+    source = source.format(content_range="".join(f" AND {cond}" for cond in content_range))
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    if table == "raw_events":
+        params = params + params
+    return f"SELECT {columns} FROM {source}{where}", params
+
+
+def export_schema(table: str) -> pa.Schema:
+    schema = pa.schema([pa.field(name, dtype) for name, _, dtype in _COLUMNS[table]])
+    if table == "scored_events":
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(LOAD_DICTIONARIES_SQL)
+            dictionaries = {str(version): sectors for version, sectors in cur.fetchall()}
+        schema = schema.with_metadata({"sector_dictionary": json.dumps(dictionaries)})
+    return schema
+
+
+def iter_record_batches(
+    table: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    batch_rows: int | None = None,
+    schema: pa.Schema | None = None,
+) -> Iterator[pa.RecordBatch]:
+    query, params = build_export_query(table, since, until)
+    schema = schema or export_schema(table)
+    for rows in iter_batches(query, params, batch_rows):
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+        )
+
+
+class _ChunkSink:
+    # Write-only file object that buffers whatever the Arrow writer emits
+    # until the caller drains it into the response.
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_export(
+    table: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    fmt: str = "arrow",
+    batch_rows: int | None = None,
+) -> Iterator[bytes]:
+    # Validates eagerly so callers can reject bad input before responding;
+    # the returned iterator emits an Arrow IPC stream or a Parquet file one
+    # record batch at a time.
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}.")
+    build_export_query(table, since, until)
+    return _stream_export(table, since, until, fmt, batch_rows)
+
+
+def _stream_export(
+    table: str, since: datetime | None, until: datetime | None, fmt: str, batch_rows: int | None
+) -> Iterator[bytes]:
+    schema = export_schema(table)
+    sink = _ChunkSink()
+    out = pa.PythonFile(sink, mode="w")
+    writer = (
+        pq.ParquetWriter(out, schema, compression="zstd") if fmt == "parquet" else pa.ipc.new_stream(out, schema)
+    )
+    try:
+        for batch in iter_record_batches(table, since, until, batch_rows, schema):
+            writer.write_batch(batch)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_to_directory(
+    out_dir: str | Path,
+    tables: tuple[str, ...] = EXPORT_TABLES,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    fmt: str = "parquet",
+    batch_rows: int | None = None,
+) -> list[tuple[Path, int]]:
+    # One file per table and month, laid out as <table>/month=YYYY-MM/ so
+    # readers can prune by directory. Each month is one partition-pruned
+    # query; months without rows leave no file.
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}.")
+    with connection() as conn:
+        months = partition_months(conn)
+    if since is not None:
+        months = [month for month in months if add_months(month, 1) > since]
+    if until is not None:
+        months = [month for month in months if month < until]
+
+    written = []
+    for table in tables:
+        schema = export_schema(table)
+        for month in months:
+            start = max(month, since) if since is not None else month
+            end = min(add_months(month, 1), until) if until is not None else add_months(month, 1)
+            path = Path(out_dir) / table / f"month={month_start(month):%Y-%m}" / f"part-0.{fmt}"
+            rows = _write_file(path, table, start, end, fmt, batch_rows, schema)
+            if rows:
+                logger.info("Exported %s rows to %s", rows, path)
+                written.append((path, rows))
+    return written
+
+
+def _write_file(
+    path: Path,
+    table: str,
+    since: datetime,
+    until: datetime,
+    fmt: str,
+    batch_rows: int | None,
+    schema: pa.Schema,
+) -> int:
+    writer = None
+    rows = 0
+    try:
+        for batch in iter_record_batches(table, since, until, batch_rows, schema):
+            if writer is None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                writer = (
+                    pq.ParquetWriter(path, schema, compression="zstd")
+                    if fmt == "parquet"
+                    else pa.ipc.new_file(path, schema)
+                )
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import psycopg
+
+logger = logging.getLogger("app.store.migrate")
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+# Serializes migration runs across workers booting at the same time.
+_ADVISORY_LOCK_KEY = 4_611_923_457
+
+_FILENAME_RE = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            raise ValueError(f"Unexpected migration file name: {path.name}")
+        migrations.append(Migration(version=int(match.group(1)), name=match.group(2), path=path))
+    versions = [migration.version for migration in migrations]
+    if versions != list(range(1, len(versions) + 1)):
+        raise ValueError(f"Migration versions must be contiguous from 1, found {versions}")
+    return migrations
+
+
+def latest_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(conn: psycopg.Connection) -> int:
+    cur = conn.cursor()
+    try:
+        with conn.transaction():
+            cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+            row = cur.fetchone()
+    except psycopg.errors.UndefinedTable:
+        return 0
+    return int(row[0]) if row else 0
+
+
+def migrate(conn: psycopg.Connection, target: int | None = None) -> list[Migration]:
+    migrations = load_migrations()
+    if target is None:
+        target = migrations[-1].version if migrations else 0
+
+    conn.commit()
+    cur = conn.cursor()
+    cur.execute("SELECT pg_advisory_lock(%s)", (_ADVISORY_LOCK_KEY,))
+    conn.commit()
+    applied: list[Migration] = []
+    try:
+        with conn.transaction():
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+        version = current_version(conn)
+        for migration in migrations:
+            if migration.version <= version or migration.version > target:
+                continue
+            logger.info("Applying migration %04d_%s", migration.version, migration.name)
+            with conn.transaction():
+                cur.execute(migration.sql())
+                cur.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+                    (migration.version, migration.name),
+                )
+            applied.append(migration)
+    finally:
+        cur.execute("SELECT pg_advisory_unlock(%s)", (_ADVISORY_LOCK_KEY,))
+        conn.commit()
+    return applied
+
+
+def ensure_schema(conn: psycopg.Connection, auto_migrate: bool = True) -> None:
+    # Startup path: one version query when the schema is already current.
+    version = current_version(conn)
+    latest = latest_version()
+    if version >= latest:
+        return
+    if not auto_migrate:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {latest}. Run python -m app.scripts.init_db."
+        )
+    applied = migrate(conn)
+    logger.info("Schema migrated from version %s to %s", version, version + len(applied))
@@ -0,0 +1,201 @@
+-- Baseline schema. Idempotent so databases built by the old per-startup
+-- init_db DDL can adopt the migration history without manual steps.
+
+CREATE TABLE IF NOT EXISTS raw_events (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    published_at TIMESTAMPTZ NOT NULL,
+    sector TEXT NOT NULL,
+    source TEXT NOT NULL,
+    payload JSONB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS normalized_events (
+    raw_event_id TEXT PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    policy_domain TEXT NOT NULL,
+    risk_signal TEXT NOT NULL,
+    rate_signal TEXT NOT NULL,
+    geo_signal TEXT NOT NULL,
+    sector_impacts JSONB NOT NULL,
+    sentiment TEXT NOT NULL,
+    rationale TEXT NOT NULL,
+    channels JSONB NOT NULL,
+    confidence DOUBLE PRECISION NOT NULL,
+    regime JSONB NOT NULL,
+    baseline JSONB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS scored_events (
+    raw_event_id TEXT PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    policy_domain TEXT NOT NULL,
+    risk_signal TEXT NOT NULL,
+    rate_signal TEXT NOT NULL,
+    geo_signal TEXT NOT NULL,
+    sector_impacts JSONB NOT NULL,
+    sentiment TEXT NOT NULL,
+    rationale TEXT NOT NULL,
+    fx_state TEXT NOT NULL,
+    sector_scores JSONB NOT NULL,
+    total_score DOUBLE PRECISION NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    channels JSONB NOT NULL,
+    confidence DOUBLE PRECISION NOT NULL,
+    regime JSONB NOT NULL,
+    baseline JSONB NOT NULL
+);
+
+ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS policy_domain TEXT NOT NULL DEFAULT '';
+ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS risk_signal TEXT NOT NULL DEFAULT '';
+ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS rate_signal TEXT NOT NULL DEFAULT '';
+ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS geo_signal TEXT NOT NULL DEFAULT '';
+ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS channels JSONB NOT NULL DEFAULT '[]';
+ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS confidence DOUBLE PRECISION NOT NULL DEFAULT 0.6;
+ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS regime JSONB NOT NULL DEFAULT '{"risk_sentiment":"neutral","volatility":"elevated","liquidity":"neutral"}';
+ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS baseline JSONB NOT NULL DEFAULT '{}';
+ALTER TABLE normalized_events ADD COLUMN IF NOT EXISTS normalized_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS policy_domain TEXT NOT NULL DEFAULT '';
+ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS risk_signal TEXT NOT NULL DEFAULT '';
+ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS rate_signal TEXT NOT NULL DEFAULT '';
+ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS geo_signal TEXT NOT NULL DEFAULT '';
+ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS channels JSONB NOT NULL DEFAULT '[]';
+ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS confidence DOUBLE PRECISION NOT NULL DEFAULT 0.6;
+ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS regime JSONB NOT NULL DEFAULT '{"risk_sentiment":"neutral","volatility":"elevated","liquidity":"neutral"}';
+ALTER TABLE scored_events ADD COLUMN IF NOT EXISTS baseline JSONB NOT NULL DEFAULT '{}';
+
+DO $$
+BEGIN
+    ALTER TABLE scored_events ALTER COLUMN total_score TYPE DOUBLE PRECISION USING total_score::double precision;
+EXCEPTION
+    WHEN undefined_column THEN NULL;
+    WHEN datatype_mismatch THEN NULL;
+END $$;
+
+-- Backward compatibility for older schema columns.
+DO $$
+BEGIN
+    ALTER TABLE normalized_events ALTER COLUMN region DROP NOT NULL;
+EXCEPTION
+    WHEN undefined_column THEN NULL;
+END $$;
+
+DO $$
+BEGIN
+    ALTER TABLE normalized_events ALTER COLUMN country DROP NOT NULL;
+EXCEPTION
+    WHEN undefined_column THEN NULL;
+END $$;
+
+DO $$
+BEGIN
+    ALTER TABLE normalized_events ALTER COLUMN fx_theme DROP NOT NULL;
+EXCEPTION
+    WHEN undefined_column THEN NULL;
+END $$;
+
+DO $$
+BEGIN
+    ALTER TABLE scored_events ALTER COLUMN region DROP NOT NULL;
+EXCEPTION
+    WHEN undefined_column THEN NULL;
+END $$;
+
+DO $$
+BEGIN
+    ALTER TABLE scored_events ALTER COLUMN country DROP NOT NULL;
+EXCEPTION
+    WHEN undefined_column THEN NULL;
+END $$;
+
+DO $$
+BEGIN
+    ALTER TABLE scored_events ALTER COLUMN fx_theme DROP NOT NULL;
+EXCEPTION
+    WHEN undefined_column THEN NULL;
+END $$;
+
+-- Join keys must share raw_events.id's type so joins can use the primary keys.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'normalized_events'
+          AND column_name = 'raw_event_id'
+          AND data_type <> 'text'
+    ) THEN
+        ALTER TABLE normalized_events ALTER COLUMN raw_event_id TYPE TEXT USING raw_event_id::text;
+    END IF;
+END $$;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'scored_events'
+          AND column_name = 'raw_event_id'
+          AND data_type <> 'text'
+    ) THEN
+        ALTER TABLE scored_events ALTER COLUMN raw_event_id TYPE TEXT USING raw_event_id::text;
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS raw_events_published_at_idx ON raw_events (published_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS scored_events_created_at_idx ON scored_events (created_at DESC);
+CREATE INDEX IF NOT EXISTS normalized_events_normalized_at_idx ON normalized_events (normalized_at DESC, raw_event_id DESC);
+
+-- Running per-sector totals backing /heatmap, kept in step with scored_events
+-- by a row trigger so upserts apply (new - old) in the writer's transaction.
+CREATE TABLE IF NOT EXISTS sector_totals (
+    sector TEXT PRIMARY KEY,
+    total DOUBLE PRECISION NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION apply_sector_totals_delta() RETURNS trigger AS $$
+DECLARE
+    new_scores JSONB := '{}'::jsonb;
+    old_scores JSONB := '{}'::jsonb;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        new_scores := NEW.sector_scores;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        old_scores := OLD.sector_scores;
+    END IF;
+    IF new_scores = old_scores THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO sector_totals (sector, total)
+    SELECT sector, SUM(delta)
+    FROM (
+        SELECT key AS sector, value::double precision AS delta FROM jsonb_each_text(new_scores)
+        UNION ALL
+        SELECT key AS sector, -(value::double precision) AS delta FROM jsonb_each_text(old_scores)
+    ) d
+    GROUP BY sector
+    ORDER BY sector
+    ON CONFLICT (sector) DO UPDATE SET total = sector_totals.total + EXCLUDED.total;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger
+        WHERE tgname = 'scored_events_sector_totals' AND tgrelid = 'scored_events'::regclass
+    ) THEN
+        CREATE TRIGGER scored_events_sector_totals
+        AFTER INSERT OR UPDATE OR DELETE ON scored_events
+        FOR EACH ROW EXECUTE FUNCTION apply_sector_totals_delta();
+    END IF;
+END $$;
+
+INSERT INTO sector_totals (sector, total)
+SELECT key, SUM(value::double precision)
+FROM scored_events, jsonb_each_text(sector_scores)
+WHERE NOT EXISTS (SELECT 1 FROM sector_totals)
+GROUP BY key;
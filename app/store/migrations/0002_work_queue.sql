@@ -0,0 +1,82 @@
+-- Durable work queue for the normalize and score stages. Jobs are enqueued
+-- and acknowledged by triggers in the writer's transaction; workers lease
+-- them with FOR UPDATE SKIP LOCKED and an available_at visibility timeout.
+CREATE TABLE IF NOT EXISTS work_queue (
+    stage TEXT NOT NULL,
+    raw_event_id TEXT NOT NULL,
+    priority TIMESTAMPTZ NOT NULL,
+    enqueued_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    available_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    leased_by TEXT,
+    last_error TEXT,
+    PRIMARY KEY (stage, raw_event_id)
+);
+
+CREATE INDEX IF NOT EXISTS work_queue_stage_priority_idx ON work_queue (stage, priority DESC);
+
+CREATE OR REPLACE FUNCTION enqueue_normalize_jobs() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO work_queue (stage, raw_event_id, priority)
+    SELECT 'normalize', id, published_at FROM inserted_raw_events
+    ON CONFLICT (stage, raw_event_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS raw_events_enqueue_normalize ON raw_events;
+CREATE TRIGGER raw_events_enqueue_normalize
+AFTER INSERT ON raw_events
+REFERENCING NEW TABLE AS inserted_raw_events
+FOR EACH STATEMENT EXECUTE FUNCTION enqueue_normalize_jobs();
+
+-- A (re-)normalized event completes its normalize job and needs (re-)scoring.
+CREATE OR REPLACE FUNCTION advance_normalized_job() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM work_queue WHERE stage = 'normalize' AND raw_event_id = NEW.raw_event_id;
+    INSERT INTO work_queue (stage, raw_event_id, priority)
+    SELECT 'score', NEW.raw_event_id, COALESCE(
+        (SELECT published_at FROM raw_events WHERE id = NEW.raw_event_id), NEW.normalized_at
+    )
+    ON CONFLICT (stage, raw_event_id) DO UPDATE SET
+        enqueued_at = now(),
+        available_at = now(),
+        attempts = 0,
+        leased_by = NULL,
+        last_error = NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS normalized_events_advance_job ON normalized_events;
+CREATE TRIGGER normalized_events_advance_job
+AFTER INSERT OR UPDATE ON normalized_events
+FOR EACH ROW EXECUTE FUNCTION advance_normalized_job();
+
+CREATE OR REPLACE FUNCTION complete_score_job() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM work_queue WHERE stage = 'score' AND raw_event_id = NEW.raw_event_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS scored_events_complete_job ON scored_events;
+CREATE TRIGGER scored_events_complete_job
+AFTER INSERT OR UPDATE ON scored_events
+FOR EACH ROW EXECUTE FUNCTION complete_score_job();
+
+-- Seed the queue from the backlog the old anti-join discovery would find.
+INSERT INTO work_queue (stage, raw_event_id, priority)
+SELECT 'normalize', r.id, r.published_at
+FROM raw_events r
+LEFT JOIN normalized_events n ON n.raw_event_id = r.id
+WHERE n.raw_event_id IS NULL
+ON CONFLICT (stage, raw_event_id) DO NOTHING;
+
+INSERT INTO work_queue (stage, raw_event_id, priority)
+SELECT 'score', n.raw_event_id, COALESCE(r.published_at, n.normalized_at)
+FROM normalized_events n
+LEFT JOIN scored_events s ON s.raw_event_id = n.raw_event_id
+LEFT JOIN raw_events r ON r.id = n.raw_event_id
+WHERE s.raw_event_id IS NULL
+ON CONFLICT (stage, raw_event_id) DO NOTHING;
@@ -0,0 +1,43 @@
+-- Explicit per-event processing state so backlog lookups hit small partial
+-- indexes instead of anti-joining raw_events against the downstream tables.
+ALTER TABLE raw_events ADD COLUMN IF NOT EXISTS state TEXT NOT NULL DEFAULT 'ingested'
+    CHECK (state IN ('ingested', 'normalizing', 'normalized', 'scored', 'failed'));
+
+UPDATE raw_events r SET state = 'scored'
+FROM scored_events s
+WHERE s.raw_event_id = r.id;
+
+UPDATE raw_events r SET state = 'normalized'
+FROM normalized_events n
+WHERE n.raw_event_id = r.id AND r.state = 'ingested';
+
+CREATE INDEX IF NOT EXISTS raw_events_ingested_idx
+ON raw_events (published_at DESC, id DESC) WHERE state = 'ingested';
+CREATE INDEX IF NOT EXISTS raw_events_normalized_idx
+ON raw_events (published_at DESC, id DESC) WHERE state = 'normalized';
+
+CREATE OR REPLACE FUNCTION advance_normalized_job() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM work_queue WHERE stage = 'normalize' AND raw_event_id = NEW.raw_event_id;
+    UPDATE raw_events SET state = 'normalized' WHERE id = NEW.raw_event_id AND state <> 'normalized';
+    INSERT INTO work_queue (stage, raw_event_id, priority)
+    SELECT 'score', NEW.raw_event_id, COALESCE(
+        (SELECT published_at FROM raw_events WHERE id = NEW.raw_event_id), NEW.normalized_at
+    )
+    ON CONFLICT (stage, raw_event_id) DO UPDATE SET
+        enqueued_at = now(),
+        available_at = now(),
+        attempts = 0,
+        leased_by = NULL,
+        last_error = NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION complete_score_job() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM work_queue WHERE stage = 'score' AND raw_event_id = NEW.raw_event_id;
+    UPDATE raw_events SET state = 'scored' WHERE id = NEW.raw_event_id AND state <> 'scored';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,25 @@
+-- Article bodies (payload.details) live in their own table so scans and
+-- joins over raw_events never read them; callers load them on demand.
+CREATE TABLE IF NOT EXISTS raw_event_content (
+    raw_event_id TEXT PRIMARY KEY,
+    details JSONB NOT NULL
+);
+
+-- Compress and move bodies out of line from ~256 bytes instead of the
+-- default ~2 KB threshold. lz4 needs a server built with it; pglz otherwise.
+ALTER TABLE raw_event_content SET (toast_tuple_target = 256);
+DO $$
+BEGIN
+    ALTER TABLE raw_event_content ALTER COLUMN details SET COMPRESSION lz4;
+EXCEPTION
+    WHEN feature_not_supported OR syntax_error OR invalid_parameter_value THEN NULL;
+END $$;
+
+INSERT INTO raw_event_content (raw_event_id, details)
+SELECT id, payload->'details'
+FROM raw_events
+WHERE payload ? 'details'
+ON CONFLICT (raw_event_id) DO NOTHING;
+
+UPDATE raw_events SET payload = payload - 'details'
+WHERE payload ? 'details';
@@ -0,0 +1,166 @@
+-- Monthly range partitions for the event tables. Every table is keyed on the
+-- event's published_at (normalized/scored/content rows carry a copy), so one
+-- month of history lives in one partition per table and retention can detach
+-- an event's rows together. Conflict targets stay stable across re-saves, and
+-- ordered scans on published_at stop at the newest partitions.
+
+CREATE OR REPLACE FUNCTION event_partition_name(parent TEXT, month TIMESTAMPTZ) RETURNS TEXT AS $$
+    SELECT parent || to_char(month AT TIME ZONE 'UTC', '"_y"YYYY"m"MM');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Creates the partition covering `month` (UTC) for each event table if it is
+-- missing. Ingest calls this for every month in a batch, so it is a cheap
+-- catalog lookup unless a new month actually has to be created.
+CREATE OR REPLACE FUNCTION ensure_event_partitions(month TIMESTAMPTZ) RETURNS void AS $$
+DECLARE
+    month_start TIMESTAMPTZ := date_trunc('month', month, 'UTC');
+    month_end TIMESTAMPTZ := date_trunc('month', month, 'UTC') + interval '1 month';
+    parent TEXT;
+    partition TEXT;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['raw_events', 'normalized_events', 'scored_events', 'raw_event_content'] LOOP
+        partition := event_partition_name(parent, month_start);
+        IF to_regclass(partition) IS NOT NULL THEN
+            CONTINUE;
+        END IF;
+        PERFORM pg_advisory_xact_lock(hashtext(partition));
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            partition, parent, month_start, month_end
+        );
+        IF parent = 'raw_event_content' THEN
+            -- Storage parameters are per partition; see 0004.
+            EXECUTE format('ALTER TABLE %I SET (toast_tuple_target = 256)', partition);
+            BEGIN
+                EXECUTE format('ALTER TABLE %I ALTER COLUMN details SET COMPRESSION lz4', partition);
+            EXCEPTION
+                WHEN feature_not_supported OR syntax_error OR invalid_parameter_value THEN NULL;
+            END;
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE raw_events RENAME TO raw_events_unpartitioned;
+ALTER TABLE normalized_events RENAME TO normalized_events_unpartitioned;
+ALTER TABLE scored_events RENAME TO scored_events_unpartitioned;
+ALTER TABLE raw_event_content RENAME TO raw_event_content_unpartitioned;
+
+CREATE TABLE raw_events (LIKE raw_events_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+PARTITION BY RANGE (published_at);
+
+CREATE TABLE normalized_events (
+    LIKE normalized_events_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    published_at TIMESTAMPTZ NOT NULL
+) PARTITION BY RANGE (published_at);
+
+CREATE TABLE scored_events (
+    LIKE scored_events_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    published_at TIMESTAMPTZ NOT NULL
+) PARTITION BY RANGE (published_at);
+
+CREATE TABLE raw_event_content (
+    LIKE raw_event_content_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    published_at TIMESTAMPTZ NOT NULL
+) PARTITION BY RANGE (published_at);
+
+-- Partitions for existing history plus the current and next month.
+SELECT ensure_event_partitions(month)
+FROM (
+    SELECT DISTINCT date_trunc('month', published_at, 'UTC') AS month FROM raw_events_unpartitioned
+    UNION
+    SELECT date_trunc('month', n.normalized_at, 'UTC')
+    FROM normalized_events_unpartitioned n
+    LEFT JOIN raw_events_unpartitioned r ON r.id = n.raw_event_id
+    WHERE r.id IS NULL
+    UNION
+    SELECT date_trunc('month', s.created_at, 'UTC')
+    FROM scored_events_unpartitioned s
+    LEFT JOIN raw_events_unpartitioned r ON r.id = s.raw_event_id
+    WHERE r.id IS NULL
+    UNION
+    SELECT date_trunc('month', now(), 'UTC')
+    UNION
+    SELECT date_trunc('month', now(), 'UTC') + interval '1 month'
+) months;
+
+-- Copy before any index or trigger exists: the data is unchanged, so queue
+-- rows and sector_totals are already correct.
+INSERT INTO raw_events SELECT * FROM raw_events_unpartitioned;
+
+INSERT INTO normalized_events
+SELECT n.*, COALESCE(r.published_at, n.normalized_at)
+FROM normalized_events_unpartitioned n
+LEFT JOIN raw_events_unpartitioned r ON r.id = n.raw_event_id;
+
+INSERT INTO scored_events
+SELECT s.*, COALESCE(r.published_at, s.created_at)
+FROM scored_events_unpartitioned s
+LEFT JOIN raw_events_unpartitioned r ON r.id = s.raw_event_id;
+
+INSERT INTO raw_event_content
+SELECT c.*, r.published_at
+FROM raw_event_content_unpartitioned c
+JOIN raw_events_unpartitioned r ON r.id = c.raw_event_id;
+
+DROP TABLE raw_events_unpartitioned;
+DROP TABLE normalized_events_unpartitioned;
+DROP TABLE scored_events_unpartitioned;
+DROP TABLE raw_event_content_unpartitioned;
+
+-- Unique keys on a partitioned table must include the partition key.
+ALTER TABLE raw_events ADD PRIMARY KEY (id, published_at);
+ALTER TABLE normalized_events ADD PRIMARY KEY (raw_event_id, published_at);
+ALTER TABLE scored_events ADD PRIMARY KEY (raw_event_id, published_at);
+ALTER TABLE raw_event_content ADD PRIMARY KEY (raw_event_id, published_at);
+
+CREATE INDEX raw_events_published_at_idx ON raw_events (published_at DESC, id DESC);
+CREATE INDEX raw_events_ingested_idx ON raw_events (published_at DESC, id DESC) WHERE state = 'ingested';
+CREATE INDEX raw_events_normalized_idx ON raw_events (published_at DESC, id DESC) WHERE state = 'normalized';
+CREATE INDEX normalized_events_normalized_at_idx ON normalized_events (normalized_at DESC, raw_event_id DESC);
+CREATE INDEX scored_events_created_at_idx ON scored_events (created_at DESC);
+
+-- Trigger functions now address raw_events by its full key so each lookup
+-- is pruned to a single partition.
+CREATE OR REPLACE FUNCTION advance_normalized_job() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM work_queue WHERE stage = 'normalize' AND raw_event_id = NEW.raw_event_id;
+    UPDATE raw_events SET state = 'normalized'
+    WHERE id = NEW.raw_event_id AND published_at = NEW.published_at AND state <> 'normalized';
+    INSERT INTO work_queue (stage, raw_event_id, priority)
+    VALUES ('score', NEW.raw_event_id, NEW.published_at)
+    ON CONFLICT (stage, raw_event_id) DO UPDATE SET
+        enqueued_at = now(),
+        available_at = now(),
+        attempts = 0,
+        leased_by = NULL,
+        last_error = NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION complete_score_job() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM work_queue WHERE stage = 'score' AND raw_event_id = NEW.raw_event_id;
+    UPDATE raw_events SET state = 'scored'
+    WHERE id = NEW.raw_event_id AND published_at = NEW.published_at AND state <> 'scored';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER raw_events_enqueue_normalize
+AFTER INSERT ON raw_events
+REFERENCING NEW TABLE AS inserted_raw_events
+FOR EACH STATEMENT EXECUTE FUNCTION enqueue_normalize_jobs();
+
+CREATE TRIGGER normalized_events_advance_job
+AFTER INSERT OR UPDATE ON normalized_events
+FOR EACH ROW EXECUTE FUNCTION advance_normalized_job();
+
+CREATE TRIGGER scored_events_sector_totals
+AFTER INSERT OR UPDATE OR DELETE ON scored_events
+FOR EACH ROW EXECUTE FUNCTION apply_sector_totals_delta();
+
+CREATE TRIGGER scored_events_complete_job
+AFTER INSERT OR UPDATE ON scored_events
+FOR EACH ROW EXECUTE FUNCTION complete_score_job();
@@ -0,0 +1,80 @@
+-- Compact sector encoding for scored_events: float4[] aligned with a
+-- versioned sector list. The JSONB columns keep only sectors outside the
+-- dictionary (normally '{}'), so rows shrink and reads skip JSON parsing.
+CREATE TABLE IF NOT EXISTS sector_dictionary (
+    version SMALLINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    sectors TEXT[] NOT NULL UNIQUE
+);
+
+-- The sector list in app.rules.weights.ALL_SECTORS when this ran; the app
+-- registers later lists itself on first write.
+INSERT INTO sector_dictionary (version, sectors)
+OVERRIDING SYSTEM VALUE
+VALUES (1, ARRAY['Autos', 'Consumer Discretionary', 'Defense', 'Energy', 'Financials', 'Growth', 'Industrials',
+                 'Materials', 'Technology', 'Utilities'])
+ON CONFLICT DO NOTHING;
+SELECT setval(pg_get_serial_sequence('sector_dictionary', 'version'), (SELECT MAX(version) FROM sector_dictionary));
+
+ALTER TABLE scored_events
+    ADD COLUMN IF NOT EXISTS sector_dict_version SMALLINT,
+    ADD COLUMN IF NOT EXISTS sector_scores_vec REAL[],
+    ADD COLUMN IF NOT EXISTS sector_impacts_vec REAL[];
+
+-- Decoded sector -> score map for SQL-side consumers (sector_totals upkeep,
+-- partition retirement). Rows without a version carry the full map in JSONB.
+CREATE OR REPLACE FUNCTION sector_scores_json(version SMALLINT, vec REAL[], extras JSONB) RETURNS JSONB AS $$
+    SELECT COALESCE(extras, '{}'::jsonb) || COALESCE((
+        SELECT jsonb_object_agg(d.sectors[e.ord], e.score)
+        FROM sector_dictionary d
+        CROSS JOIN LATERAL unnest(vec) WITH ORDINALITY e(score, ord)
+        WHERE d.version = $1 AND e.score IS NOT NULL
+    ), '{}'::jsonb);
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION apply_sector_totals_delta() RETURNS trigger AS $$
+DECLARE
+    new_scores JSONB := '{}'::jsonb;
+    old_scores JSONB := '{}'::jsonb;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        new_scores := sector_scores_json(NEW.sector_dict_version, NEW.sector_scores_vec, NEW.sector_scores);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        old_scores := sector_scores_json(OLD.sector_dict_version, OLD.sector_scores_vec, OLD.sector_scores);
+    END IF;
+    IF new_scores = old_scores THEN
+        RETURN NULL;
+    END IF;
+    INSERT INTO sector_totals (sector, total)
+    SELECT sector, SUM(delta)
+    FROM (
+        SELECT key AS sector, value::double precision AS delta FROM jsonb_each_text(new_scores)
+        UNION ALL
+        SELECT key AS sector, -(value::double precision) AS delta FROM jsonb_each_text(old_scores)
+    ) d
+    GROUP BY sector
+    ORDER BY sector
+    ON CONFLICT (sector) DO UPDATE SET total = sector_totals.total + EXCLUDED.total;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Re-encoding leaves every score unchanged, so skip the row triggers.
+ALTER TABLE scored_events DISABLE TRIGGER USER;
+
+UPDATE scored_events s SET
+    sector_dict_version = d.version,
+    sector_scores_vec = (
+        SELECT array_agg((s.sector_scores ->> x.name)::real ORDER BY x.ord)
+        FROM unnest(d.sectors) WITH ORDINALITY x(name, ord)
+    ),
+    sector_impacts_vec = (
+        SELECT array_agg((s.sector_impacts ->> x.name)::real ORDER BY x.ord)
+        FROM unnest(d.sectors) WITH ORDINALITY x(name, ord)
+    ),
+    sector_scores = s.sector_scores - d.sectors,
+    sector_impacts = s.sector_impacts - d.sectors
+FROM sector_dictionary d
+WHERE d.version = 1 AND s.sector_dict_version IS NULL;
+
+ALTER TABLE scored_events ENABLE TRIGGER USER;
@@ -0,0 +1,7 @@
+-- backlog_counts runs one COUNT per backlog state. 'ingested' and
+-- 'normalized' already have partial indexes; these cover the other two so
+-- no count scans every raw_events partition.
+CREATE INDEX IF NOT EXISTS raw_events_normalizing_idx
+ON raw_events (published_at DESC, id DESC) WHERE state = 'normalizing';
+CREATE INDEX IF NOT EXISTS raw_events_failed_idx
+ON raw_events (published_at DESC, id DESC) WHERE state = 'failed';
@@ -0,0 +1,4 @@
+-- Windowed heatmaps filter scored_events on published_at. Partition pruning
+-- only narrows them to a month, and the primary key leads with raw_event_id,
+-- so a short window needs its own index.
+CREATE INDEX IF NOT EXISTS scored_events_published_at_idx ON scored_events (published_at DESC);
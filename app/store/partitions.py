@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+import re
+from datetime import datetime, timezone
+
+import psycopg
+from psycopg import sql
+
+logger = logging.getLogger("app.store.partitions")
+
+# Partitioned together on published_at; see migration 0005.
+EVENT_TABLES = ("raw_events", "normalized_events", "scored_events", "raw_event_content")
+
+_SUFFIX_RE = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def ensure_partitions(conn: psycopg.Connection, months_ahead: int, now: datetime | None = None) -> list[datetime]:
+    # Pre-create the current and upcoming months so ingest never has to.
+    current = month_start(now or datetime.now(timezone.utc))
+    months = [add_months(current, offset) for offset in range(max(months_ahead, 0) + 1)]
+    cur = conn.cursor()
+    for month in months:
+        cur.execute("SELECT ensure_event_partitions(%s)", (month,))
+    return months
+
+
+def partition_months(conn: psycopg.Connection) -> list[datetime]:
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'raw_events'::regclass
+        """
+    )
+    months = []
+    for (name,) in cur.fetchall():
+        match = _SUFFIX_RE.search(name)
+        if match:
+            months.append(datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc))
+    return sorted(months)
+
+
+def expired_months(conn: psycopg.Connection, retention_months: int, now: datetime | None = None) -> list[datetime]:
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+    return [month for month in partition_months(conn) if month < cutoff]
+
+
+def retire_month(conn: psycopg.Connection, month: datetime, archive_schema: str | None) -> None:
+    # Detach one month from every event table in a single transaction. The
+    # month's scores are taken out of sector_totals and its queue rows are
+    # dropped first, since detaching fires no triggers. Detached tables move
+    # to `archive_schema`, or are dropped when it is None.
+    cur = conn.cursor()
+    names = {}
+    for table in EVENT_TABLES:
+        cur.execute("SELECT event_partition_name(%s, %s)", (table, month))
+        names[table] = cur.fetchone()[0]
+    cur.execute(
+        sql.SQL(
+            """
+            INSERT INTO sector_totals (sector, total)
+            SELECT e.key, -SUM(e.value::double precision)
+            FROM {scored} s
+            CROSS JOIN LATERAL jsonb_each_text(
+                sector_scores_json(s.sector_dict_version, s.sector_scores_vec, s.sector_scores)
+            ) e
+            GROUP BY e.key
+            ORDER BY e.key
+            ON CONFLICT (sector) DO UPDATE SET total = sector_totals.total + EXCLUDED.total
+            """
+        ).format(scored=sql.Identifier(names["scored_events"]))
+    )
+    cur.execute(
+        sql.SQL("DELETE FROM work_queue q USING {raw} r WHERE q.raw_event_id = r.id").format(
+            raw=sql.Identifier(names["raw_events"])
+        )
+    )
+    if archive_schema:
+        cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(archive_schema)))
+    for table in EVENT_TABLES:
+        partition = sql.Identifier(names[table])
+        cur.execute(
+            sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(sql.Identifier(table), partition)
+        )
+        if archive_schema:
+            cur.execute(sql.SQL("ALTER TABLE {} SET SCHEMA {}").format(partition, sql.Identifier(archive_schema)))
+        else:
+            cur.execute(sql.SQL("DROP TABLE {}").format(partition))
+    logger.info("Retired partitions for %s archive=%s", month.strftime("%Y-%m"), archive_schema or "dropped")
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Iterable, Mapping
+
+import psycopg
+
+from app.rules.weights import ALL_SECTORS
+
+# Sector scores are stored as a float4[] aligned with a versioned sector list
+# in sector_dictionary; NULL elements mark sectors the event has no value for,
+# and names outside the dictionary stay in the JSONB column as extras. Rows
+# written before the encoding existed have no version and keep the full dict.
+# Elements are REAL, so stored scores keep about 7 significant digits rather
+# than the float8 precision the JSONB values had; extras keep full precision.
+# Version 1 is seeded by migration 0006 as a copy of ALL_SECTORS at the time;
+# baseline_drift() reports when the code's list has moved away from it.
+
+BASELINE_VERSION = 1
+
+LOAD_DICTIONARIES_SQL = "SELECT version, sectors FROM sector_dictionary"
+REGISTER_DICTIONARY_SQL = "INSERT INTO sector_dictionary (sectors) VALUES (%s) ON CONFLICT (sectors) DO NOTHING"
+
+_dictionaries: dict[int, tuple[str, ...]] = {}
+_current_version: int | None = None
+_lock = threading.Lock()
+
+
+def _load(rows: Iterable[tuple[int, list[str]]]) -> None:
+    global _current_version
+    current = tuple(ALL_SECTORS)
+    with _lock:
+        for version, sectors in rows:
+            _dictionaries[int(version)] = tuple(sectors)
+            if tuple(sectors) == current:
+                _current_version = int(version)
+
+
+def needs_load(versions: Iterable[int | None]) -> bool:
+    return _current_version is None or any(v is not None and v not in _dictionaries for v in versions)
+
+
+def ensure_dictionary(conn: psycopg.Connection, versions: Iterable[int | None] = ()) -> int:
+    # Registers the running code's sector list on first use and reloads when a
+    # row references a version this process has not seen yet.
+    versions = list(versions)
+    if needs_load(versions):
+        cur = conn.cursor()
+        cur.execute(REGISTER_DICTIONARY_SQL, (list(ALL_SECTORS),))
+        cur.execute(LOAD_DICTIONARIES_SQL)
+        _load(cur.fetchall())
+    return _current_version  # type: ignore[return-value]
+
+
+async def async_ensure_dictionary(conn: psycopg.AsyncConnection, versions: Iterable[int | None] = ()) -> int:
+    versions = list(versions)
+    if needs_load(versions):
+        cur = conn.cursor()
+        await cur.execute(REGISTER_DICTIONARY_SQL, (list(ALL_SECTORS),))
+        await cur.execute(LOAD_DICTIONARIES_SQL)
+        _load(await cur.fetchall())
+    return _current_version  # type: ignore[return-value]
+
+
+def baseline_drift(conn: psycopg.Connection) -> str | None:
+    # None when dictionary v1 matches ALL_SECTORS, otherwise what differs.
+    cur = conn.cursor()
+    cur.execute("SELECT sectors FROM sector_dictionary WHERE version = %s", (BASELINE_VERSION,))
+    row = cur.fetchone()
+    if row is None:
+        return f"sector_dictionary has no version {BASELINE_VERSION}"
+    stored, current = list(row[0]), list(ALL_SECTORS)
+    if stored == current:
+        return None
+    return f"sector_dictionary v{BASELINE_VERSION} is {stored}, ALL_SECTORS is {current}"
+
+
+def row_versions(rows: Iterable[Mapping[str, Any]], key: str = "sector_dict_version") -> set[int | None]:
+    return {row.get(key) for row in rows if row}
+
+
+def encode(values: Mapping[str, float], version: int) -> tuple[list[float | None], dict[str, float]]:
+    sectors = _dictionaries[version]
+    vector: list[float | None] = [None] * len(sectors)
+    index = {name: position for position, name in enumerate(sectors)}
+    extras = {}
+    for name, value in values.items():
+        position = index.get(name)
+        if position is None:
+            extras[name] = value
+        else:
+            vector[position] = value
+    return vector, extras
+
+
+def decode(version: int | None, vector: list[float | None] | None, extras: Mapping[str, Any] | None) -> dict[str, float]:
+    values: dict[str, float] = {}
+    if version is not None and vector is not None:
+        for name, value in zip(_dictionaries[version], vector):
+            if value is not None:
+                values[name] = value
+    if extras:
+        values.update(extras)
+    return values
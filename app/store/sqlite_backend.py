@@ -0,0 +1,705 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.ingest.raw_store import BACKLOG_STATES
+from app.models import EventBundle, NormalizedEvent, RawEvent, ScoredEvent
+from app.store.event_store import (
+    _bundles_in_order,
+    _graph_edges_from_rows,
+    _heatmap_from_rows,
+    _normalized_from_row,
+    _scored_from_row,
+    _timeline_item,
+    build_page_query,
+)
+from app.store.work_queue import NORMALIZE_STAGE, SCORE_STAGE, worker_id
+
+SCHEMA_VERSION = 1
+
+# Mirrors the Postgres schema minus partitioning; JSON columns are TEXT and
+# timestamps are fixed-width UTC ISO strings so they sort lexically. State
+# transitions the Postgres triggers perform are done inline by the writers.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS raw_events (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    sector TEXT NOT NULL,
+    source TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'ingested'
+        CHECK (state IN ('ingested', 'normalizing', 'normalized', 'scored', 'failed'))
+);
+CREATE INDEX IF NOT EXISTS raw_events_published_at_idx ON raw_events (published_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS raw_events_ingested_idx ON raw_events (published_at DESC, id DESC) WHERE state = 'ingested';
+CREATE INDEX IF NOT EXISTS raw_events_normalized_idx ON raw_events (published_at DESC, id DESC) WHERE state = 'normalized';
+CREATE INDEX IF NOT EXISTS raw_events_state_idx ON raw_events (state);
+
+CREATE TABLE IF NOT EXISTS raw_event_content (
+    raw_event_id TEXT PRIMARY KEY,
+    details TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS normalized_events (
+    raw_event_id TEXT PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    policy_domain TEXT NOT NULL,
+    risk_signal TEXT NOT NULL,
+    rate_signal TEXT NOT NULL,
+    geo_signal TEXT NOT NULL,
+    sector_impacts TEXT NOT NULL,
+    sentiment TEXT NOT NULL,
+    rationale TEXT NOT NULL,
+    channels TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    regime TEXT NOT NULL,
+    baseline TEXT NOT NULL,
+    normalized_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS scored_events (
+    raw_event_id TEXT PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    policy_domain TEXT NOT NULL,
+    risk_signal TEXT NOT NULL,
+    rate_signal TEXT NOT NULL,
+    geo_signal TEXT NOT NULL,
+    sector_impacts TEXT NOT NULL,
+    sentiment TEXT NOT NULL,
+    rationale TEXT NOT NULL,
+    fx_state TEXT NOT NULL,
+    sector_scores TEXT NOT NULL,
+    total_score REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    channels TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    regime TEXT NOT NULL,
+    baseline TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scored_events_created_at_idx ON scored_events (created_at DESC);
+
+CREATE TABLE IF NOT EXISTS sector_totals (
+    sector TEXT PRIMARY KEY,
+    total REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS work_queue (
+    stage TEXT NOT NULL,
+    raw_event_id TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    enqueued_at TEXT NOT NULL,
+    available_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    leased_by TEXT,
+    last_error TEXT,
+    PRIMARY KEY (stage, raw_event_id)
+);
+CREATE INDEX IF NOT EXISTS work_queue_stage_priority_idx ON work_queue (stage, priority DESC);
+"""
+
+_RAW_COLUMNS = "r.id, r.title, r.url, r.published_at, r.sector, r.source, r.payload"
+_NORMALIZED_JSON = ("sector_impacts", "channels", "regime", "baseline")
+_SCORED_JSON = ("sector_impacts", "sector_scores", "channels", "regime", "baseline")
+
+_NORMALIZED_UPSERT = """
+INSERT INTO normalized_events
+(raw_event_id, event_type, policy_domain, risk_signal, rate_signal, geo_signal, sector_impacts, sentiment, rationale,
+ channels, confidence, regime, baseline, normalized_at)
+VALUES (:raw_event_id, :event_type, :policy_domain, :risk_signal, :rate_signal, :geo_signal, :sector_impacts, :sentiment,
+        :rationale, :channels, :confidence, :regime, :baseline, :normalized_at)
+ON CONFLICT (raw_event_id) DO UPDATE SET
+    event_type = excluded.event_type,
+    policy_domain = excluded.policy_domain,
+    risk_signal = excluded.risk_signal,
+    rate_signal = excluded.rate_signal,
+    geo_signal = excluded.geo_signal,
+    sector_impacts = excluded.sector_impacts,
+    sentiment = excluded.sentiment,
+    rationale = excluded.rationale,
+    channels = excluded.channels,
+    confidence = excluded.confidence,
+    regime = excluded.regime,
+    baseline = excluded.baseline,
+    normalized_at = excluded.normalized_at
+"""
+
+_SCORED_UPSERT = """
+INSERT INTO scored_events
+(raw_event_id, event_type, policy_domain, risk_signal, rate_signal, geo_signal, sector_impacts, sentiment, rationale,
+ fx_state, sector_scores, total_score, created_at, channels, confidence, regime, baseline)
+VALUES (:raw_event_id, :event_type, :policy_domain, :risk_signal, :rate_signal, :geo_signal, :sector_impacts, :sentiment,
+        :rationale, :fx_state, :sector_scores, :total_score, :created_at, :channels, :confidence, :regime, :baseline)
+ON CONFLICT (raw_event_id) DO UPDATE SET
+    event_type = excluded.event_type,
+    policy_domain = excluded.policy_domain,
+    risk_signal = excluded.risk_signal,
+    rate_signal = excluded.rate_signal,
+    geo_signal = excluded.geo_signal,
+    sector_impacts = excluded.sector_impacts,
+    sentiment = excluded.sentiment,
+    rationale = excluded.rationale,
+    fx_state = excluded.fx_state,
+    sector_scores = excluded.sector_scores,
+    total_score = excluded.total_score,
+    created_at = excluded.created_at,
+    channels = excluded.channels,
+    confidence = excluded.confidence,
+    regime = excluded.regime,
+    baseline = excluded.baseline
+"""
+
+_ENQUEUE_SQL = """
+INSERT INTO work_queue (stage, raw_event_id, priority, enqueued_at, available_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (stage, raw_event_id) DO UPDATE SET
+    enqueued_at = excluded.enqueued_at,
+    available_at = excluded.available_at,
+    attempts = 0,
+    leased_by = NULL,
+    last_error = NULL
+"""
+
+_PAGE_JOIN = """
+FROM raw_events r
+JOIN scored_events s ON s.raw_event_id = r.id
+{where}
+ORDER BY r.published_at {direction}, r.id {direction}
+LIMIT %s
+"""
+
+TIMELINE_SQL = (
+    "SELECT r.id, r.title, r.url, r.published_at, r.sector, s.risk_signal, s.rate_signal, s.geo_signal, "
+    "s.fx_state, s.sentiment, s.total_score" + _PAGE_JOIN
+)
+GRAPH_EDGES_SQL = (
+    "SELECT r.id, r.published_at, r.title, s.fx_state, s.risk_signal, s.rate_signal, s.geo_signal, "
+    "s.sector_scores" + _PAGE_JOIN
+)
+
+
+def _ts(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def _now() -> str:
+    return _ts(datetime.now(timezone.utc))
+
+
+def _after(seconds: float) -> str:
+    return _ts(datetime.fromtimestamp(datetime.now(timezone.utc).timestamp() + seconds, timezone.utc))
+
+
+def _params(model: BaseModel) -> dict[str, Any]:
+    values = {}
+    for key, value in model.model_dump().items():
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, ensure_ascii=True)
+        elif isinstance(value, datetime):
+            value = _ts(value)
+        values[key] = value
+    return values
+
+
+def _row(row: sqlite3.Row, json_columns: Iterable[str] = ()) -> dict[str, Any]:
+    values = dict(row)
+    for key in json_columns:
+        if values.get(key) is not None:
+            values[key] = json.loads(values[key])
+    for key in ("published_at", "created_at"):
+        if isinstance(values.get(key), str):
+            values[key] = datetime.fromisoformat(values[key])
+    return values
+
+
+def _raw_from_row(row: sqlite3.Row) -> RawEvent:
+    values = _row(row, ("payload", "details"))
+    payload = values["payload"] or {}
+    if values.get("details") is not None:
+        payload["details"] = values["details"]
+    return RawEvent(
+        id=values["id"],
+        title=values["title"],
+        url=values["url"],
+        published_at=values["published_at"],
+        sector=values["sector"],
+        source=values["source"],
+        payload=payload,
+    )
+
+
+def _chunks(items: list[str], size: int = 500) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _marks(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+class SqliteBackend:
+    name = "sqlite"
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path or settings.db_path
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=settings.db_pool_timeout_sec,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(f"PRAGMA busy_timeout = {int(settings.db_pool_timeout_sec * 1000)}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        # Writers take the database lock up front (BEGIN IMMEDIATE) so a
+        # read-then-write such as a claim cannot be interleaved.
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def init(self) -> None:
+        conn = self._connect()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    async def aclose(self) -> None:
+        return None
+
+    # Raw events
+
+    def save_raw_events(self, events: Iterable[RawEvent]) -> int:
+        batch = list(events)
+        if not batch:
+            return 0
+        count = 0
+        now = _now()
+        with self._transaction(write=True) as conn:
+            for event in batch:
+                payload = dict(event.payload)
+                details = payload.pop("details", None)
+                published_at = _ts(event.published_at)
+                cur = conn.execute(
+                    "INSERT INTO raw_events (id, title, url, published_at, sector, source, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (id) DO NOTHING",
+                    (
+                        event.id,
+                        event.title,
+                        event.url,
+                        published_at,
+                        event.sector,
+                        event.source,
+                        json.dumps(payload, ensure_ascii=True),
+                    ),
+                )
+                if cur.rowcount <= 0:
+                    continue
+                count += 1
+                if details is not None:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO raw_event_content (raw_event_id, details) VALUES (?, ?)",
+                        (event.id, json.dumps(details, ensure_ascii=True)),
+                    )
+                conn.execute(_ENQUEUE_SQL, (NORMALIZE_STAGE, event.id, published_at, now, now))
+        return count
+
+    def fetch_unprocessed_raw_events(self, limit: int = 200, include_details: bool = True) -> list[RawEvent]:
+        columns, join = self._details_projection(include_details)
+        with self._transaction() as conn:
+            rows = conn.execute(
+                f"SELECT {columns} FROM raw_events r {join} WHERE r.state = 'ingested' "
+                "ORDER BY r.published_at DESC, r.id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [_raw_from_row(row) for row in rows]
+
+    def fetch_raw_event(self, raw_event_id: str, include_details: bool = True) -> RawEvent | None:
+        columns, join = self._details_projection(include_details)
+        with self._transaction() as conn:
+            row = conn.execute(f"SELECT {columns} FROM raw_events r {join} WHERE r.id = ?", (raw_event_id,)).fetchone()
+        return _raw_from_row(row) if row else None
+
+    def fetch_raw_event_details(self, raw_event_id: str) -> dict[str, Any] | None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT details FROM raw_event_content WHERE raw_event_id = ?", (raw_event_id,)).fetchone()
+        return json.loads(row["details"]) if row else None
+
+    def attach_details(self, events: list[RawEvent]) -> list[RawEvent]:
+        missing = {event.id: event for event in events if "details" not in event.payload}
+        if not missing:
+            return events
+        with self._transaction() as conn:
+            for ids in _chunks(list(missing)):
+                rows = conn.execute(
+                    f"SELECT raw_event_id, details FROM raw_event_content WHERE raw_event_id IN ({_marks(len(ids))})",
+                    ids,
+                ).fetchall()
+                for row in rows:
+                    missing[row["raw_event_id"]].payload["details"] = json.loads(row["details"])
+        return events
+
+    def recent_raw_event_ids(self, limit: int) -> list[str]:
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id FROM raw_events ORDER BY published_at DESC, id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def backlog_counts(self) -> dict[str, int]:
+        counts = {state: 0 for state in BACKLOG_STATES}
+        with self._transaction() as conn:
+            for row in conn.execute("SELECT state, COUNT(*) AS n FROM raw_events GROUP BY state"):
+                if row["state"] in counts:
+                    counts[row["state"]] = int(row["n"])
+        return counts
+
+    @staticmethod
+    def _details_projection(include_details: bool) -> tuple[str, str]:
+        if include_details:
+            return f"{_RAW_COLUMNS}, c.details", "LEFT JOIN raw_event_content c ON c.raw_event_id = r.id"
+        return _RAW_COLUMNS, ""
+
+    # Normalized and scored events
+
+    def save_normalized(self, event: NormalizedEvent) -> None:
+        self.save_normalized_many([event])
+
+    def save_normalized_many(self, events: Iterable[NormalizedEvent]) -> int:
+        batch = list(events)
+        if not batch:
+            return 0
+        now = _now()
+        saved = 0
+        with self._transaction(write=True) as conn:
+            for event in batch:
+                # Events without a raw row are skipped, as in Postgres.
+                row = conn.execute("SELECT published_at FROM raw_events WHERE id = ?", (event.raw_event_id,)).fetchone()
+                if row is None:
+                    continue
+                conn.execute(_NORMALIZED_UPSERT, {**_params(event), "normalized_at": now})
+                # What the Postgres advance_normalized_job trigger does.
+                conn.execute(
+                    "DELETE FROM work_queue WHERE stage = ? AND raw_event_id = ?", (NORMALIZE_STAGE, event.raw_event_id)
+                )
+                conn.execute(
+                    "UPDATE raw_events SET state = 'normalized' WHERE id = ? AND state <> 'normalized'",
+                    (event.raw_event_id,),
+                )
+                conn.execute(_ENQUEUE_SQL, (SCORE_STAGE, event.raw_event_id, row["published_at"], now, now))
+                saved += 1
+        return saved
+
+    def fetch_unscored_events(self, limit: int = 200) -> list[NormalizedEvent]:
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT n.* FROM raw_events r JOIN normalized_events n ON n.raw_event_id = r.id "
+                "WHERE r.state = 'normalized' ORDER BY r.published_at DESC, r.id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [_normalized_from_row(_row(row, _NORMALIZED_JSON)) for row in rows]
+
+    def fetch_normalized_event(self, raw_event_id: str) -> NormalizedEvent | None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM normalized_events WHERE raw_event_id = ?", (raw_event_id,)).fetchone()
+        return _normalized_from_row(_row(row, _NORMALIZED_JSON)) if row else None
+
+    def save_scored(self, event: ScoredEvent) -> None:
+        self.save_scored_many([event])
+
+    def save_scored_many(self, events: Iterable[ScoredEvent]) -> int:
+        batch = list(events)
+        if not batch:
+            return 0
+        saved = 0
+        with self._transaction(write=True) as conn:
+            for event in batch:
+                if conn.execute("SELECT 1 FROM raw_events WHERE id = ?", (event.raw_event_id,)).fetchone() is None:
+                    continue
+                old = conn.execute(
+                    "SELECT sector_scores FROM scored_events WHERE raw_event_id = ?", (event.raw_event_id,)
+                ).fetchone()
+                conn.execute(_SCORED_UPSERT, _params(event))
+                # What the Postgres sector_totals and complete_score_job triggers do.
+                deltas: dict[str, float] = {}
+                for sector, score in event.sector_scores.items():
+                    deltas[sector] = deltas.get(sector, 0.0) + float(score)
+                if old:
+                    for sector, score in json.loads(old["sector_scores"]).items():
+                        deltas[sector] = deltas.get(sector, 0.0) - float(score)
+                conn.executemany(
+                    "INSERT INTO sector_totals (sector, total) VALUES (?, ?) "
+                    "ON CONFLICT (sector) DO UPDATE SET total = total + excluded.total",
+                    sorted(deltas.items()),
+                )
+                conn.execute(
+                    "DELETE FROM work_queue WHERE stage = ? AND raw_event_id = ?", (SCORE_STAGE, event.raw_event_id)
+                )
+                conn.execute(
+                    "UPDATE raw_events SET state = 'scored' WHERE id = ? AND state <> 'scored'", (event.raw_event_id,)
+                )
+                saved += 1
+        return saved
+
+    def fetch_scored_event(self, raw_event_id: str) -> ScoredEvent | None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM scored_events WHERE raw_event_id = ?", (raw_event_id,)).fetchone()
+        return _scored_from_row(_row(row, _SCORED_JSON)) if row else None
+
+    def fetch_event_bundle(self, raw_event_id: str) -> EventBundle | None:
+        bundles = self.fetch_event_bundles([raw_event_id])
+        return bundles[0] if bundles else None
+
+    def fetch_event_bundles(self, raw_event_ids: Iterable[str]) -> list[EventBundle]:
+        # In-process lookups cost no round trips, so one read transaction with
+        # a query per table stands in for the Postgres join.
+        ids = list(dict.fromkeys(raw_event_ids))
+        bundles = []
+        with self._transaction() as conn:
+            for chunk in _chunks(ids):
+                marks = _marks(len(chunk))
+                raws = conn.execute(
+                    f"SELECT {_RAW_COLUMNS}, c.details FROM raw_events r "
+                    f"LEFT JOIN raw_event_content c ON c.raw_event_id = r.id WHERE r.id IN ({marks})",
+                    chunk,
+                ).fetchall()
+                normalized = {
+                    row["raw_event_id"]: _normalized_from_row(_row(row, _NORMALIZED_JSON))
+                    for row in conn.execute(f"SELECT * FROM normalized_events WHERE raw_event_id IN ({marks})", chunk)
+                }
+                scored = {
+                    row["raw_event_id"]: _scored_from_row(_row(row, _SCORED_JSON))
+                    for row in conn.execute(f"SELECT * FROM scored_events WHERE raw_event_id IN ({marks})", chunk)
+                }
+                for row in raws:
+                    raw = _raw_from_row(row)
+                    bundles.append(EventBundle(raw=raw, normalized=normalized.get(raw.id), scored=scored.get(raw.id)))
+        return _bundles_in_order(ids, bundles)
+
+    def latest_created_at(self) -> datetime | None:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT created_at FROM scored_events ORDER BY created_at DESC LIMIT 1").fetchone()
+        return datetime.fromisoformat(row["created_at"]) if row else None
+
+    # Read models
+
+    def _page(self, template: str, limit: int, before: str | None, after: str | None) -> list[dict[str, Any]]:
+        sql, params = build_page_query(template, limit, before, after)
+        params = tuple(_ts(value) if isinstance(value, datetime) else value for value in params)
+        with self._transaction() as conn:
+            rows = [_row(row, ("sector_scores",)) for row in conn.execute(sql.replace("%s", "?"), params)]
+        if after:
+            rows.reverse()
+        return rows
+
+    def list_timeline(self, limit: int = 50, before: str | None = None, after: str | None = None) -> list[dict[str, object]]:
+        return [_timeline_item(row) for row in self._page(TIMELINE_SQL, limit, before, after)]
+
+    def graph_edges(self, limit: int = 100, before: str | None = None, after: str | None = None) -> list[dict[str, object]]:
+        rows = self._page(GRAPH_EDGES_SQL, limit, before, after)
+        return _graph_edges_from_rows(rows, paged=bool(before or after))
+
+    # Streaming reads. A sqlite3 connection is bound to the thread that opened
+    # it, while a streamed response is pulled from worker threads, so pages are
+    # read whole and then yielded.
+
+    def iter_timeline(self, limit: int = 50, before: str | None = None) -> Iterator[dict[str, object]]:
+        yield from self.list_timeline(limit, before)
+
+    def iter_graph_edges(self, limit: int = 100, before: str | None = None) -> Iterator[dict[str, object]]:
+        yield from _graph_edges_from_rows(self._page(GRAPH_EDGES_SQL, limit, before, None), paged=True)
+
+    def iter_unprocessed_raw_events(self, limit: int = 200, include_details: bool = True) -> Iterator[RawEvent]:
+        yield from self.fetch_unprocessed_raw_events(limit, include_details)
+
+    def sector_heatmap(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        sector: str | None = None,
+        event_type: str | None = None,
+    ) -> dict[str, float]:
+        if since is None and until is None and event_type is None:
+            sql, params = "SELECT sector, total FROM sector_totals", []
+            if sector is not None:
+                sql, params = sql + " WHERE sector = ?", [sector]
+        else:
+            conditions = []
+            params = []
+            if since is not None:
+                conditions.append("r.published_at >= ?")
+                params.append(_ts(since))
+            if until is not None:
+                conditions.append("r.published_at < ?")
+                params.append(_ts(until))
+            if event_type is not None:
+                conditions.append("s.event_type = ?")
+                params.append(event_type)
+            if sector is not None:
+                conditions.append("e.key = ?")
+                params.append(sector)
+            sql = (
+                "SELECT e.key AS sector, SUM(e.value) AS total FROM scored_events s "
+                "JOIN raw_events r ON r.id = s.raw_event_id, json_each(s.sector_scores) e "
+                f"WHERE {' AND '.join(conditions)} GROUP BY e.key"
+            )
+        with self._transaction() as conn:
+            rows = [dict(row) for row in conn.execute(sql, params)]
+        return _heatmap_from_rows(rows, sector)
+
+    # Work queue
+
+    def claim_raw_events(self, limit: int = 200, lease_sec: int | None = None) -> list[RawEvent]:
+        with self._transaction(write=True) as conn:
+            ids = self._lease(conn, NORMALIZE_STAGE, limit, lease_sec)
+            if not ids:
+                return []
+            conn.execute(
+                f"UPDATE raw_events SET state = 'normalizing' WHERE state = 'ingested' AND id IN ({_marks(len(ids))})",
+                ids,
+            )
+            rows = conn.execute(f"SELECT {_RAW_COLUMNS} FROM raw_events r WHERE r.id IN ({_marks(len(ids))})", ids)
+            by_id = {row["id"]: _raw_from_row(row) for row in rows}
+        return [by_id[raw_event_id] for raw_event_id in ids if raw_event_id in by_id]
+
+    def claim_unscored_events(self, limit: int = 200, lease_sec: int | None = None) -> list[NormalizedEvent]:
+        with self._transaction(write=True) as conn:
+            ids = self._lease(conn, SCORE_STAGE, limit, lease_sec)
+            if not ids:
+                return []
+            rows = conn.execute(f"SELECT * FROM normalized_events WHERE raw_event_id IN ({_marks(len(ids))})", ids)
+            by_id = {row["raw_event_id"]: _normalized_from_row(_row(row, _NORMALIZED_JSON)) for row in rows}
+        return [by_id[raw_event_id] for raw_event_id in ids if raw_event_id in by_id]
+
+    @staticmethod
+    def _lease(conn: sqlite3.Connection, stage: str, limit: int, lease_sec: int | None) -> list[str]:
+        # The IMMEDIATE transaction holds the write lock, which is what
+        # SKIP LOCKED buys on Postgres: no two workers see the same job.
+        # Leases that expired on their last attempt are parked and their
+        # events marked failed first, as in Postgres.
+        exhausted = conn.execute(
+            "UPDATE work_queue SET leased_by = NULL, last_error = 'lease expired after ' || attempts || ' attempts' "
+            "WHERE stage = ? AND available_at <= ? AND attempts >= ? AND leased_by IS NOT NULL RETURNING raw_event_id",
+            (stage, _now(), settings.queue_max_attempts),
+        ).fetchall()
+        if exhausted:
+            failed = [row["raw_event_id"] for row in exhausted]
+            conn.execute(f"UPDATE raw_events SET state = 'failed' WHERE id IN ({_marks(len(failed))})", failed)
+        rows = conn.execute(
+            "SELECT raw_event_id FROM work_queue WHERE stage = ? AND available_at <= ? AND attempts < ? "
+            "ORDER BY priority DESC LIMIT ?",
+            (stage, _now(), settings.queue_max_attempts, limit),
+        ).fetchall()
+        ids = [row["raw_event_id"] for row in rows]
+        if ids:
+            conn.execute(
+                f"UPDATE work_queue SET available_at = ?, attempts = attempts + 1, leased_by = ? "
+                f"WHERE stage = ? AND raw_event_id IN ({_marks(len(ids))})",
+                (_after(lease_sec if lease_sec is not None else settings.queue_lease_sec), worker_id(), stage, *ids),
+            )
+        return ids
+
+    def release_jobs(self, stage: str, raw_event_ids: Iterable[str], error: str = "") -> int:
+        ids = list(raw_event_ids)
+        if not ids:
+            return 0
+        retry_state = "ingested" if stage == NORMALIZE_STAGE else "normalized"
+        with self._transaction(write=True) as conn:
+            # Only jobs this worker still holds, as in Postgres.
+            rows = conn.execute(
+                f"UPDATE work_queue SET available_at = ?, leased_by = NULL, last_error = ? "
+                f"WHERE stage = ? AND leased_by = ? AND raw_event_id IN ({_marks(len(ids))}) RETURNING raw_event_id",
+                (_after(settings.queue_retry_backoff_sec), error[:1000], stage, worker_id(), *ids),
+            ).fetchall()
+            ids = [row["raw_event_id"] for row in rows]
+            if not ids:
+                return 0
+            conn.execute(
+                f"""
+                UPDATE raw_events SET state = CASE WHEN (
+                    SELECT q.attempts FROM work_queue q WHERE q.stage = ? AND q.raw_event_id = raw_events.id
+                ) >= ? THEN 'failed' ELSE ? END
+                WHERE id IN ({_marks(len(ids))})
+                  AND id IN (SELECT raw_event_id FROM work_queue WHERE stage = ?)
+                """,
+                (stage, settings.queue_max_attempts, retry_state, *ids, stage),
+            )
+        return len(ids)
+
+    # Async entry points run the blocking calls on a worker thread.
+
+    async def afetch_raw_event(self, raw_event_id: str, include_details: bool = True) -> RawEvent | None:
+        return await asyncio.to_thread(self.fetch_raw_event, raw_event_id, include_details)
+
+    async def afetch_event_bundle(self, raw_event_id: str) -> EventBundle | None:
+        return await asyncio.to_thread(self.fetch_event_bundle, raw_event_id)
+
+    async def afetch_event_bundles(self, raw_event_ids: Iterable[str]) -> list[EventBundle]:
+        return await asyncio.to_thread(self.fetch_event_bundles, list(raw_event_ids))
+
+    async def afetch_normalized_event(self, raw_event_id: str) -> NormalizedEvent | None:
+        return await asyncio.to_thread(self.fetch_normalized_event, raw_event_id)
+
+    async def afetch_scored_event(self, raw_event_id: str) -> ScoredEvent | None:
+        return await asyncio.to_thread(self.fetch_scored_event, raw_event_id)
+
+    async def alist_timeline(
+        self, limit: int = 50, before: str | None = None, after: str | None = None
+    ) -> list[dict[str, object]]:
+        return await asyncio.to_thread(self.list_timeline, limit, before, after)
+
+    async def agraph_edges(
+        self, limit: int = 100, before: str | None = None, after: str | None = None
+    ) -> list[dict[str, object]]:
+        return await asyncio.to_thread(self.graph_edges, limit, before, after)
+
+    async def asector_heatmap(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        sector: str | None = None,
+        event_type: str | None = None,
+    ) -> dict[str, float]:
+        return await asyncio.to_thread(self.sector_heatmap, since, until, sector, event_type)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from typing import Iterable
+
+from psycopg.rows import dict_row
+
+from app.config import settings
+from app.ingest.raw_store import _RAW_COLUMNS, _raw_from_row
+from app.models import NormalizedEvent, RawEvent
+from app.store.db import connection
+from app.store.event_store import _normalized_from_row
+
+NORMALIZE_STAGE = "normalize"
+SCORE_STAGE = "score"
+
+# Lease up to `limit` available jobs, skipping rows another worker holds, and
+# return the payload rows in the same statement. A lease pushes available_at
+# out by the visibility timeout so jobs from crashed workers are re-offered.
+# A job's priority is its raw event's published_at, so joins back to the
+# event tables use the full (id, published_at) key and touch one partition.
+# A lease that expired on its last allowed attempt (the worker crashed or
+# timed out and never released it) can't be claimed again; the same
+# statement parks it and marks its event failed, as release_jobs would.
+_CLAIM_SQL = """
+WITH exhausted AS (
+    UPDATE work_queue q SET
+        leased_by = NULL,
+        last_error = 'lease expired after ' || q.attempts || ' attempts'
+    WHERE q.stage = %(stage)s AND q.available_at <= now() AND q.attempts >= %(max_attempts)s
+      AND q.leased_by IS NOT NULL
+    RETURNING q.raw_event_id, q.priority
+),
+failed AS (
+    UPDATE raw_events r SET state = 'failed'
+    FROM exhausted e
+    WHERE r.id = e.raw_event_id AND r.published_at = e.priority AND r.state <> 'failed'
+),
+claimable AS (
+    SELECT stage, raw_event_id
+    FROM work_queue
+    WHERE stage = %(stage)s AND available_at <= now() AND attempts < %(max_attempts)s
+    ORDER BY priority DESC
+    LIMIT %(limit)s
+    FOR UPDATE SKIP LOCKED
+),
+leased AS (
+    UPDATE work_queue q SET
+        available_at = now() + make_interval(secs => %(lease_sec)s),
+        attempts = q.attempts + 1,
+        leased_by = %(worker)s
+    FROM claimable c
+    WHERE q.stage = c.stage AND q.raw_event_id = c.raw_event_id
+    RETURNING q.raw_event_id, q.priority
+){mark}
+{select}
+"""
+
+CLAIM_RAW_EVENTS_SQL = _CLAIM_SQL.format(
+    mark=""",
+marked AS (
+    UPDATE raw_events r SET state = 'normalizing'
+    FROM leased l
+    WHERE r.id = l.raw_event_id AND r.published_at = l.priority AND r.state = 'ingested'
+)""",
+    select=f"""SELECT {_RAW_COLUMNS} FROM leased l
+JOIN raw_events r ON r.id = l.raw_event_id AND r.published_at = l.priority
+ORDER BY l.priority DESC"""
+)
+
+CLAIM_NORMALIZED_EVENTS_SQL = _CLAIM_SQL.format(
+    mark="",
+    select="""SELECT n.* FROM leased l
+JOIN normalized_events n ON n.raw_event_id = l.raw_event_id AND n.published_at = l.priority
+ORDER BY l.priority DESC"""
+)
+
+
+def worker_id() -> str:
+    # Per thread: a job is claimed and released on the same thread, and two
+    # request threads in one process must not release each other's leases.
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _claim_params(stage: str, limit: int, lease_sec: int | None) -> dict[str, object]:
+    return {
+        "stage": stage,
+        "limit": limit,
+        "lease_sec": lease_sec if lease_sec is not None else settings.queue_lease_sec,
+        "max_attempts": settings.queue_max_attempts,
+        "worker": worker_id(),
+    }
+
+
+def claim_raw_events(limit: int = 200, lease_sec: int | None = None) -> list[RawEvent]:
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(CLAIM_RAW_EVENTS_SQL, _claim_params(NORMALIZE_STAGE, limit, lease_sec))
+        rows = cur.fetchall()
+    return [_raw_from_row(row) for row in rows]
+
+
+def claim_unscored_events(limit: int = 200, lease_sec: int | None = None) -> list[NormalizedEvent]:
+    with connection() as conn:
+        cur = conn.cursor(row_factory=dict_row)
+        cur.execute(CLAIM_NORMALIZED_EVENTS_SQL, _claim_params(SCORE_STAGE, limit, lease_sec))
+        rows = cur.fetchall()
+    return [_normalized_from_row(row) for row in rows]
+
+
+def release_jobs(stage: str, raw_event_ids: Iterable[str], error: str = "") -> int:
+    # Hand failed jobs back after a backoff and roll the event's state back.
+    # Jobs that reach the attempt limit stay parked in the table with their
+    # last error, and the event is marked failed. Only jobs this worker still
+    # holds are released: once a lease has expired and another worker has
+    # claimed the job, a late failure leaves it alone.
+    ids = list(raw_event_ids)
+    if not ids:
+        return 0
+    retry_state = "ingested" if stage == NORMALIZE_STAGE else "normalized"
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            WITH released AS (
+                UPDATE work_queue SET
+                    available_at = now() + make_interval(secs => %(backoff)s),
+                    leased_by = NULL,
+                    last_error = %(error)s
+                WHERE stage = %(stage)s AND raw_event_id = ANY(%(ids)s) AND leased_by = %(worker)s
+                RETURNING raw_event_id, priority, attempts
+            )
+            UPDATE raw_events r SET
+                state = CASE WHEN rel.attempts >= %(max_attempts)s THEN 'failed' ELSE %(retry_state)s END
+            FROM released rel
+            WHERE r.id = rel.raw_event_id AND r.published_at = rel.priority
+            """,
+            {
+                "backoff": settings.queue_retry_backoff_sec,
+                "error": error[:1000],
+                "stage": stage,
+                "ids": ids,
+                "max_attempts": settings.queue_max_attempts,
+                "retry_state": retry_state,
+                "worker": worker_id(),
+            },
+        )
+        return max(cur.rowcount, 0)
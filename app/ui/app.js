@@ -1,5 +1,6 @@
 const statusEl = document.getElementById("status");
 const runBtn = document.getElementById("runPipeline");
+const forceRescore = document.getElementById("forceRescore");
 const refreshBtn = document.getElementById("refreshViews");
 const categorySelect = document.getElementById("categorySelect");
 const newsList = document.getElementById("newsList");
@@ -322,8 +323,10 @@ runBtn.addEventListener("click", async () => {
   setStatus("Running pipeline for selected news...");
   try {
     const selected = encodeURIComponent(selectedNewsId);
-    await fetchJson(`/pipeline/run_one?raw_event_id=${selected}`, { method: "POST" });
-    setStatus("Pipeline complete.");
+    // Already scored events are reused unless a rescore is asked for.
+    const force = forceRescore && forceRescore.checked ? "&force=true" : "";
+    const result = await fetchJson(`/pipeline/run_one?raw_event_id=${selected}${force}`, { method: "POST" });
+    setStatus(result.scored ? "Pipeline complete." : "Already scored. Tick Rescore to run it again.");
     await refresh();
   } catch (err) {
     setStatus(`Error: ${err.message}`);
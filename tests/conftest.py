@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+from typing import Iterator
+
+import psycopg
+import pytest
+from psycopg.conninfo import make_conninfo
+
+from app.config import settings
+from app.store import db
+from app.store.backend import PostgresBackend, StorageBackend
+from app.store.sqlite_backend import SqliteBackend
+
+TEST_SCHEMA = "fim_test"
+
+
+def _database_url() -> str:
+    # Database tests run against DATABASE_URL and are skipped without one.
+    database_url = os.getenv("DATABASE_URL") or settings.database_url
+    if not database_url:
+        pytest.skip("DATABASE_URL is not set")
+    return database_url
+
+
+@pytest.fixture
+def pg_conn() -> Iterator[psycopg.Connection]:
+    try:
+        conn = psycopg.connect(_database_url())
+    except psycopg.OperationalError as exc:
+        pytest.skip(f"Postgres is not reachable: {exc}")
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def store(request: pytest.FixtureRequest, tmp_path, monkeypatch) -> Iterator[StorageBackend]:
+    # Each backend starts empty: SQLite in a temporary file, Postgres in a
+    # scratch schema that the pooled store modules see through search_path.
+    if request.param == "sqlite":
+        backend = SqliteBackend(str(tmp_path / "events.db"))
+        backend.init()
+        yield backend
+        backend.close()
+        return
+
+    conn = request.getfixturevalue("pg_conn")
+    conn.autocommit = True
+    conn.execute(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE")
+    conn.execute(f"CREATE SCHEMA {TEST_SCHEMA}")
+    monkeypatch.setenv("DATABASE_URL", make_conninfo(_database_url(), options=f"-c search_path={TEST_SCHEMA}"))
+    monkeypatch.setattr(settings, "db_auto_migrate", True)
+    db.close_pool()
+    backend = PostgresBackend()
+    try:
+        backend.init()
+        yield backend
+    finally:
+        db.close_pool()
+        conn.execute(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE")
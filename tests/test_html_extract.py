@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import re
+from html import unescape
+from pathlib import Path
+
+import pytest
+
+from app.ingest.html_extract import BODY_MAX_CHARS, extract_article
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "articles"
+
+# Expected (title, published, body, summary) per fixture page; ap_live_blog.html
+# fills the body cap, so only its head is pinned.
+EXPECTED = {
+    "ap_rates_decision.html": (
+        "Fed holds rates steady as inflation cools & hiring slows",
+        "2026-01-28T19:02:11Z",
+        "The Federal Reserve building in Washington. "
+        "WASHINGTON (AP) — The Federal Reserve kept its key interest rate unchanged on Wednesday, "
+        "pointing to cooler inflation and a job market that has lost some momentum. "
+        "“We’re well positioned to wait,” the Fed chair said at a news conference. "
+        "The decision leaves the benchmark rate in a range of 3.5% to 3.75%.\xa0Markets had widely expected the move. "
+        "Related: Mortgage rates dip "
+        "Copyright 2026 The Associated Press. All Rights Reserved.",
+        "The Federal Reserve left its benchmark rate unchanged, citing cooler inflation and a softer job market.",
+    ),
+    "ap_pubdate_meta.html": (
+        "Oil prices climb after OPEC+ supply cuts",
+        "2026-02-03T08:15:00Z",
+        "Oil prices rose on Tuesday after major producers agreed to extend output cuts. "
+        "Brent crude gained 1.4% & U.S. benchmark crude rose 1.1%. "
+        "Analysts said the cuts would tighten supply through the spring.",
+        "",
+    ),
+    "ap_video_only.html": (
+        "Crowds gather for championship parade",
+        "2026-02-12T16:45:00Z",
+        "Thousands of fans lined the streets for the championship parade.",
+        "Thousands of fans lined the streets for the championship parade.",
+    ),
+}
+
+# Inline pages for the tag-name cases that used to hide <meta> tags.
+CASES = [
+    (
+        '<svg><path d="M0 0"></path></svg><meta property="og:title" content="OG">'
+        '<meta property="og:description" content="D"><title>T</title><p>Body</p>',
+        ("OG", "", "Body", "D"),
+    ),
+    (
+        '<title>T</title><pre>code</pre><picture><img src="x"></picture><p class="lead">One</p><p>Two</p>',
+        ("T", "", "One Two", ""),
+    ),
+]
+
+
+def _pages() -> list[Path]:
+    return sorted(FIXTURES_DIR.glob("*.html"))
+
+
+# Reference copy of the per-call regex helpers that extract_article replaced,
+# with paragraphs matched on the whole tag name.
+def _legacy_extract_article(html: str) -> tuple[str, str, str, str]:
+    title = _legacy_meta(html, "property", "og:title") or _legacy_title(html)
+    summary = _legacy_meta(html, "property", "og:description") or ""
+    published = _legacy_meta(html, "property", "article:published_time") or _legacy_meta(html, "name", "pubdate") or ""
+    texts = []
+    for match in re.findall(r"<p\b[^>]*>(.*?)</p>", html, flags=re.IGNORECASE | re.DOTALL):
+        cleaned = _legacy_strip_html(match)
+        if cleaned:
+            texts.append(cleaned)
+    body = " ".join(texts)[:4000] or summary
+    return title, published, body, summary
+
+
+def _legacy_meta(html: str, attr: str, value: str) -> str:
+    pattern = rf'<meta[^>]+{attr}="{re.escape(value)}"[^>]+content="([^"]+)"'
+    match = re.search(pattern, html, flags=re.IGNORECASE)
+    return unescape(match.group(1)).strip() if match else ""
+
+
+def _legacy_title(html: str) -> str:
+    match = re.search(r"<title>([^<]+)</title>", html, flags=re.IGNORECASE)
+    return unescape(match.group(1)).strip() if match else ""
+
+
+def _legacy_strip_html(text: str) -> str:
+    text = re.sub(r"<script[^>]*>.*?</script>", " ", text, flags=re.DOTALL | re.IGNORECASE)
+    text = re.sub(r"<style[^>]*>.*?</style>", " ", text, flags=re.DOTALL | re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return unescape(text)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_fixture_pages_extract_expected_fields(name):
+    html = (FIXTURES_DIR / name).read_text(encoding="utf-8")
+    assert extract_article(html) == EXPECTED[name]
+
+
+def test_live_blog_body_is_capped():
+    html = (FIXTURES_DIR / "ap_live_blog.html").read_text(encoding="utf-8")
+    title, published, body, summary = extract_article(html)
+    assert title == "Live updates: Storm makes landfall on the Gulf Coast"
+    assert published == "2026-03-10T12:00:00Z"
+    assert summary == "Follow live coverage of the storm."
+    assert len(body) == BODY_MAX_CHARS
+    assert body.startswith("Paragraph 0 of the live blog with an update on the storm & its path.")
+
+
+@pytest.mark.parametrize("path", _pages(), ids=lambda path: path.name)
+def test_matches_legacy_helpers(path):
+    html = path.read_text(encoding="utf-8")
+    assert extract_article(html) == _legacy_extract_article(html)
+
+
+@pytest.mark.parametrize("html, expected", CASES)
+def test_tag_name_cases(html, expected):
+    assert extract_article(html) == expected
+    assert _legacy_extract_article(html) == expected
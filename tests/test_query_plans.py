@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from app.scripts.check_query_plans import HOT_QUERIES, check_plans
+
+# Large enough that a missing index shows up as a sequential scan, small
+# enough to seed in a few seconds. The script's 1M-row default remains the
+# realistic check.
+ROWS = 50_000
+BACKLOG = 200
+
+
+def test_hot_queries_avoid_seq_scans(pg_conn):
+    results = check_plans(pg_conn, ROWS, BACKLOG)
+    assert set(results) == {name for name, _, _ in HOT_QUERIES}
+    scanned = {name: relations for name, relations in results.items() if relations}
+    assert not scanned, f"Sequential scans on hot tables: {scanned}"
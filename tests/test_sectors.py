@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import re
+
+from app.rules.weights import ALL_SECTORS
+from app.store.migrate import MIGRATIONS_DIR
+
+
+def test_seeded_dictionary_matches_all_sectors():
+    # Migration 0006 seeds dictionary v1 as a literal copy of ALL_SECTORS.
+    sql = (MIGRATIONS_DIR / "0006_sector_vectors.sql").read_text(encoding="utf-8")
+    literal = re.search(r"VALUES \(1, ARRAY\[(.*?)\]\)", sql, flags=re.DOTALL)
+    assert literal is not None
+    assert re.findall(r"'([^']*)'", literal.group(1)) == list(ALL_SECTORS)
+
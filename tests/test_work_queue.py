@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+from app.models import RawEvent
+from app.store.work_queue import NORMALIZE_STAGE
+
+
+def _raw_event(index: int) -> RawEvent:
+    return RawEvent(
+        id=f"event-{index}",
+        title=f"Event {index}",
+        url=f"https://example.com/{index}",
+        published_at=datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(hours=index),
+        sector="macro",
+        source="test",
+        payload={"item": {"title": f"Event {index}"}, "details": {"summary": "", "text": ""}},
+    )
+
+
+def test_expired_lease_at_max_attempts_marks_event_failed(store, monkeypatch):
+    # Every claim lets its lease lapse at once, as if the worker had crashed
+    # without releasing the job.
+    monkeypatch.setattr(settings, "queue_max_attempts", 2)
+    store.save_raw_events([_raw_event(1)])
+    for _ in range(settings.queue_max_attempts):
+        assert [event.id for event in store.claim_raw_events(limit=1, lease_sec=0)] == ["event-1"]
+        time.sleep(0.01)
+        assert store.backlog_counts()["normalizing"] == 1
+
+    assert store.claim_raw_events(limit=1) == []
+    counts = store.backlog_counts()
+    assert counts["failed"] == 1
+    assert counts["normalizing"] == 0
+
+
+def test_release_after_lease_expiry_leaves_new_holder_alone(store, monkeypatch):
+    store.save_raw_events([_raw_event(1)])
+    assert store.claim_raw_events(limit=1, lease_sec=0)
+    time.sleep(0.01)
+    # Another worker re-claims the expired lease.
+    with monkeypatch.context() as patch:
+        patch.setattr("app.store.work_queue.worker_id", lambda: "other-worker")
+        patch.setattr("app.store.sqlite_backend.worker_id", lambda: "other-worker")
+        assert store.claim_raw_events(limit=1)
+
+    assert store.release_jobs(NORMALIZE_STAGE, ["event-1"], "late failure") == 0
+    assert store.backlog_counts()["normalizing"] == 1
+    assert store.claim_raw_events(limit=1) == []